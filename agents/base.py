@@ -15,6 +15,9 @@ from services.skill_extractor import get_skill_extractor
 
 logger = logging.getLogger(__name__)
 
+# Scraped jobs are dedup-checked this many at a time (one query per batch)
+DEDUP_BATCH_SIZE = 200
+
 class BaseJobAgent(ABC):
     """Abstract base class for job discovery agents."""
     
@@ -55,36 +58,37 @@ class BaseJobAgent(ABC):
             raw_jobs = await self._search_jobs(search_params)
             result.results_count = len(raw_jobs)
             
-            # Process and store jobs
-            for idx, raw_job in enumerate(raw_jobs, 1):
-                try:
-                    # Check for duplicates
-                    is_dup, existing_id = await self.deduplicator.is_duplicate(raw_job)
-                    
-                    if is_dup:
-                        result.duplicate_jobs_count += 1
-                        logger.debug(f"Job {idx}/{len(raw_jobs)} is duplicate: {raw_job.url}")
+            # Process and store jobs, dedup-checking a batch at a time
+            for start in range(0, len(raw_jobs), DEDUP_BATCH_SIZE):
+                batch = raw_jobs[start:start + DEDUP_BATCH_SIZE]
+                dup_results = await self.deduplicator.is_duplicate_batch(batch)
+                
+                for idx, (raw_job, is_dup) in enumerate(zip(batch, dup_results), start + 1):
+                    try:
+                        if is_dup:
+                            result.duplicate_jobs_count += 1
+                            logger.debug(f"Job {idx}/{len(raw_jobs)} is duplicate: {raw_job.url}")
+                            continue
+                        
+                        # Store raw job
+                        raw_job_id = await self._store_raw_job(raw_job)
+                        logger.debug(f"Stored raw job {idx}/{len(raw_jobs)}: {raw_job_id}")
+                        
+                        # Normalize and store processed job
+                        job = await self._normalize_job(raw_job)
+                        job.raw_job_id = raw_job_id
+                        await self._store_job(job)
+                        
+                        result.new_jobs_count += 1
+                        logger.info(f"Job {idx}/{len(raw_jobs)} inserted: {job.title} at {job.company}")
+                        
+                    except Exception as e:
+                        logger.error(
+                            f"Error processing job {idx}/{len(raw_jobs)} - {raw_job.url}: {e}",
+                            exc_info=True  # This shows full stack trace
+                        )
+                        # Don't increment any counter for failed jobs
                         continue
-                    
-                    # Store raw job
-                    raw_job_id = await self._store_raw_job(raw_job)
-                    logger.debug(f"Stored raw job {idx}/{len(raw_jobs)}: {raw_job_id}")
-                    
-                    # Normalize and store processed job
-                    job = await self._normalize_job(raw_job)
-                    job.raw_job_id = raw_job_id
-                    await self._store_job(job)
-                    
-                    result.new_jobs_count += 1
-                    logger.info(f"Job {idx}/{len(raw_jobs)} inserted: {job.title} at {job.company}")
-                    
-                except Exception as e:
-                    logger.error(
-                        f"Error processing job {idx}/{len(raw_jobs)} - {raw_job.url}: {e}",
-                        exc_info=True  # This shows full stack trace
-                    )
-                    # Don't increment any counter for failed jobs
-                    continue
             
             result.status = SearchStatus.COMPLETED
             result.completed_at = datetime.utcnow()
@@ -124,7 +128,7 @@ class BaseJobAgent(ABC):
         )
         
         async with self.db.acquire() as conn:
-            result = await conn.fetchrow(
+            search_id = await conn.fetchval(
                 """
                 INSERT INTO job_searches (
                     search_query, location, platform, filters, 
@@ -140,7 +144,7 @@ class BaseJobAgent(ABC):
                 datetime.utcnow(),
                 SearchStatus.PENDING.value
             )
-            return str(result['id'])
+            return str(search_id)
     
     async def _update_search_record(
         self, 
@@ -169,7 +173,7 @@ class BaseJobAgent(ABC):
     async def _store_raw_job(self, raw_job: RawJob) -> str:
         """Store raw job data."""
         async with self.db.acquire() as conn:
-            result = await conn.fetchrow(
+            raw_job_id = await conn.fetchval(
                 """
                 INSERT INTO raw_jobs (
                     platform, external_id, url, raw_data, 
@@ -188,7 +192,7 @@ class BaseJobAgent(ABC):
                 raw_job.scraped_at,
                 raw_job.content_hash
             )
-            return str(result['id'])
+            return str(raw_job_id)
     
     async def _store_job(self, job: Job) -> str:
         """Store normalized job."""
@@ -202,7 +206,7 @@ class BaseJobAgent(ABC):
             logger.info(f"Extracted {len(job.skills)} skills for job: {job.title}")
             
         async with self.db.acquire() as conn:
-            result = await conn.fetchrow(
+            job_id = await conn.fetchval(
                 """
                 INSERT INTO jobs (
                     raw_job_id, title, company, location, location_type,
@@ -236,4 +240,4 @@ class BaseJobAgent(ABC):
                 json.dumps(job.keywords),  # Convert list to JSON
                 job.processed_at, job.status
             )
-            return str(result['id'])
\ No newline at end of file
+            return str(job_id)
\ No newline at end of file
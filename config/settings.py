@@ -10,6 +10,10 @@ class Settings(BaseSettings):
     DB_PASSWORD: str = ""
     DB_NAME: str = "jobply"
     
+    # Database - Connection pool
+    DB_POOL_MIN_SIZE: int = 2
+    DB_POOL_MAX_SIZE: int = 20
+    
     # Database - URL format (for compatibility)
     DATABASE_URL: Optional[str] = None
     
@@ -43,6 +47,11 @@ class Settings(BaseSettings):
         "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
     ]
     
+    # Embeddings
+    EMBEDDING_BACKEND: str = "torch"  # "torch" or "onnx" (needs optimum[onnxruntime])
+    EMBEDDING_ONNX_FILE: Optional[str] = "onnx/model_qint8_avx512_vnni.onnx"
+    EMBEDDING_DEVICE: Optional[str] = None  # e.g. "cuda:0"; default: CUDA if available
+    
     # Logging
     LOG_LEVEL: str = "INFO"
     
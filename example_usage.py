@@ -8,6 +8,7 @@ import asyncpg
 from pathlib import Path
 from uuid import UUID
 
+from services.database import init_connection
 from services.resume_service import ResumeService
 from models.generated_resume import TailoredResumeData
 from services.pdf_generator import PDFGenerator
@@ -24,13 +25,14 @@ async def example_single_resume():
         host='localhost',
         port=5432,
         database='jobply',
-        user='pujashrestha'
+        user='pujashrestha',
+        init=init_connection
     )
     
+    # Initialize service
+    resume_service = ResumeService(pool, Path('./example_output'))
+    
     try:
-        # Initialize service
-        resume_service = ResumeService(pool, Path('./example_output'))
-        
         # Replace with your actual UUIDs
         user_id = UUID('00000000-0000-0000-0000-000000000000')  # Replace!
         job_id = UUID('00000000-0000-0000-0000-000000000000')   # Replace!
@@ -57,6 +59,7 @@ async def example_single_resume():
             print("\n❌ Failed to generate resume")
     
     finally:
+        resume_service.close()
         await pool.close()
 
 
@@ -71,13 +74,14 @@ async def example_batch_generation():
         host='localhost',
         port=5432,
         database='jobply',
-        user='pujashrestha'
+        user='pujashrestha',
+        init=init_connection
     )
     
+    # Initialize service
+    resume_service = ResumeService(pool, Path('./example_output'))
+    
     try:
-        # Initialize service
-        resume_service = ResumeService(pool, Path('./example_output'))
-        
         # Replace with your actual user UUID
         user_id = UUID('00000000-0000-0000-0000-000000000000')  # Replace!
         
@@ -101,6 +105,7 @@ async def example_batch_generation():
             print()
     
     finally:
+        resume_service.close()
         await pool.close()
 
 
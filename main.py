@@ -3,7 +3,7 @@ import asyncio
 import sys
 from services.database import db
 from services.rate_limiter import PlatformRateLimiter
-from services.deduplicator import JobDeduplicator
+from services.deduplicator import JobDeduplicator, scrape_watermark
 from agents.jsearch_agent import JSearchAgent
 from models.search import JobSearchParams
 from config.settings import settings
@@ -42,15 +42,25 @@ async def test_jsearch():
         logger.info(f"Starting job search: {search_params.query}")
         logger.info("="*60)
         
+        # Same clock as raw_jobs.scraped_at (naive UTC from RawJob), whatever
+        # the database session's timezone
+        search_started = scrape_watermark()
+        
         # Execute search
         result = await jsearch_agent.search_and_store(search_params)
         
+        # Fuzzy dedup runs in bulk after ingest (not per job while storing)
+        soft_duplicates = await deduplicator.find_soft_duplicates_bulk(search_started)
+        
         # Display results
         logger.info("="*60)
         logger.info(f"Search Status: {result.status.value}")
         logger.info(f"Total Results: {result.results_count}")
         logger.info(f"New Jobs: {result.new_jobs_count}")
         logger.info(f"Duplicates: {result.duplicate_jobs_count}")
+        logger.info(f"Fuzzy duplicates: {len(soft_duplicates)}")
+        for duplicate_id, original_id in soft_duplicates:
+            logger.info(f"  {duplicate_id} looks like a repost of {original_id}")
         logger.info(f"Duration: {(result.completed_at - result.started_at).total_seconds():.2f}s")
 
         if result.error_message:
@@ -83,4 +93,11 @@ async def test_jsearch():
     return 0
 
 if __name__ == "__main__":
+    # uvloop is optional (not available on Windows); fall back to the default loop
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
     sys.exit(asyncio.run(test_jsearch()))
\ No newline at end of file
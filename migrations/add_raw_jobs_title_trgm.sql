@@ -0,0 +1,19 @@
+-- Migration: Indexed fuzzy-duplicate lookup on raw_jobs
+-- Stores lowercased title/company alongside raw_data so the dedup fuzzy check
+-- can prune candidates with an index instead of extracting JSON per row
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+ALTER TABLE raw_jobs
+    ADD COLUMN IF NOT EXISTS title_norm TEXT
+        GENERATED ALWAYS AS (lower(raw_data->>'title')) STORED,
+    ADD COLUMN IF NOT EXISTS company_norm TEXT
+        GENERATED ALWAYS AS (lower(raw_data->>'company')) STORED;
+
+-- Trigram similarity on titles (title_norm % $1)
+CREATE INDEX IF NOT EXISTS idx_raw_jobs_title_trgm
+    ON raw_jobs USING gin (title_norm gin_trgm_ops);
+
+-- Recent postings for one company on one platform
+CREATE INDEX IF NOT EXISTS idx_raw_jobs_platform_company_scraped
+    ON raw_jobs(platform, company_norm, scraped_at DESC);
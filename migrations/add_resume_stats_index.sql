@@ -0,0 +1,10 @@
+-- Migration: Covering index for generated resume statistics
+-- Holds every column get_statistics() aggregates (ats_score,
+-- keyword_match_rate, file_size_bytes, created_at), so on a vacuumed table
+-- it can use an index-only scan instead of visiting the heap (and its
+-- JSONB/BYTEA columns). idx_generated_resumes_user_profile is kept for the
+-- other per-user lookups.
+
+CREATE INDEX IF NOT EXISTS idx_generated_resumes_user_profile_stats
+    ON generated_resumes(user_profile_id)
+    INCLUDE (ats_score, keyword_match_rate, file_size_bytes, created_at);
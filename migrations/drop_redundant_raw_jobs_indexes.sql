@@ -0,0 +1,10 @@
+-- Migration: Drop raw_jobs indexes duplicated by its unique constraints
+-- unique_platform_url and unique_content_hash already back the dedup lookups
+-- (platform = $1 AND url = $2, content_hash = $1) with unique btree indexes;
+-- these plain copies only add write cost on every scraped job
+
+-- Same column as the unique_content_hash index
+DROP INDEX IF EXISTS idx_raw_jobs_content_hash;
+
+-- Leading column of the unique_platform_url index
+DROP INDEX IF EXISTS idx_raw_jobs_platform;
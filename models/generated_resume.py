@@ -234,8 +234,10 @@ class GeneratedResumeRepository:
             SELECT 
                 COUNT(*) as total_resumes,
                 AVG(ats_score) as avg_ats_score,
+                MAX(ats_score) as max_ats_score,
                 AVG(keyword_match_rate) as avg_keyword_match,
                 AVG(file_size_bytes) as avg_file_size,
+                COALESCE(SUM(file_size_bytes), 0) / 1048576.0 as total_size_mb,
                 MIN(created_at) as first_generated,
                 MAX(created_at) as last_generated
             FROM generated_resumes
@@ -247,8 +249,10 @@ class GeneratedResumeRepository:
             return {
                 'total_resumes': row['total_resumes'],
                 'avg_ats_score': float(row['avg_ats_score']) if row['avg_ats_score'] else 0,
+                'max_ats_score': float(row['max_ats_score']) if row['max_ats_score'] else 0,
                 'avg_keyword_match': float(row['avg_keyword_match']) if row['avg_keyword_match'] else 0,
                 'avg_file_size_kb': round(row['avg_file_size'] / 1024, 2) if row['avg_file_size'] else 0,
+                'total_size_mb': round(float(row['total_size_mb']), 2),
                 'first_generated': row['first_generated'],
                 'last_generated': row['last_generated']
             }
@@ -272,7 +276,12 @@ class GeneratedResumeRepository:
     
     def _row_to_model(self, row: asyncpg.Record) -> GeneratedResume:
         """Convert database row to GeneratedResume model"""
-        resume_data = TailoredResumeData.model_validate_json(row['resume_data'])
+        # Pools with the JSONB codec hand back a dict, plain pools the JSON text
+        resume_data = row['resume_data']
+        if isinstance(resume_data, str):
+            resume_data = TailoredResumeData.model_validate_json(resume_data)
+        else:
+            resume_data = TailoredResumeData.model_validate(resume_data)
         
         return GeneratedResume(
             id=row['id'],
@@ -3,6 +3,7 @@ from pydantic import BaseModel, HttpUrl, Field, field_validator
 from typing import Optional, List, Union
 from datetime import datetime
 from enum import Enum
+from functools import cached_property
 from uuid import UUID
 import hashlib
 import json
@@ -34,9 +35,19 @@ class RawJob(BaseModel):
     raw_data: dict
     scraped_at: datetime = Field(default_factory=datetime.utcnow)
     
-    @property
+    @cached_property
+    def title_lower(self) -> str:
+        """Lowercased title, normalized once for dedup."""
+        return (self.raw_data.get("title") or "").lower()
+    
+    @cached_property
+    def company_lower(self) -> str:
+        """Lowercased company, normalized once for dedup."""
+        return (self.raw_data.get("company") or "").lower()
+    
+    @cached_property
     def content_hash(self) -> str:
-        """Generate content hash for deduplication."""
+        """Generate content hash for deduplication (computed once per job)."""
         # Normalize data for consistent hashing
         normalized = {
             "title": self.raw_data.get("title", "").lower().strip(),
@@ -3,12 +3,12 @@ Job Scoring Orchestrator
 Coordinates the job scoring pipeline: fetch jobs, score them, store results
 """
 import asyncio
-import json
 from typing import List, Optional
 from datetime import datetime
 from uuid import UUID
 import logging
 
+from config.settings import settings
 from database.connection import Database
 from services.scoring_engine import ScoringEngine
 from services.embeddings import EmbeddingService
@@ -24,7 +24,11 @@ class JobScoringOrchestrator:
     
     def __init__(self, db: Database):
         self.db = db
-        self.embedding_service = EmbeddingService()
+        self.embedding_service = EmbeddingService(
+            backend=settings.EMBEDDING_BACKEND,
+            onnx_file_name=settings.EMBEDDING_ONNX_FILE,
+            device=settings.EMBEDDING_DEVICE
+        )
         self.scoring_engine = ScoringEngine(self.embedding_service)
     
     async def score_all_jobs(
@@ -55,16 +59,8 @@ class JobScoringOrchestrator:
         
         logger.info(f"Found {len(jobs)} jobs to score")
         
-        # 2. Score each job
-        scored_jobs = []
-        for job in jobs:
-            try:
-                score = await self.scoring_engine.score_job(job, user_profile)
-                scored_jobs.append(score)
-                logger.debug(f"Scored job {job.id}: {score.overall_score:.2f}")
-            except Exception as e:
-                logger.error(f"Error scoring job {job.id}: {e}")
-                continue
+        # 2. Score all jobs (embeddings are computed in one batch)
+        scored_jobs = await self.scoring_engine.score_jobs(jobs, user_profile)
         
         # 3. Store scores in database
         await self._store_scores(scored_jobs, user_profile.id)
@@ -126,11 +122,9 @@ class JobScoringOrchestrator:
         jobs = []
         for row in rows:
             try:
-                # Parse skills if it's JSONB
+                # JSONB arrives decoded via the pool codec
                 skills = row['skills']
-                if isinstance(skills, str):
-                    skills = json.loads(skills)
-                elif not isinstance(skills, list):
+                if not isinstance(skills, list):
                     skills = []
                 
                 job = Job(
@@ -165,7 +159,7 @@ class JobScoringOrchestrator:
         for score in scored_jobs:
             try:
                 # Check if score already exists
-                existing = await self.db.fetchrow(
+                existing = await self.db.fetchval(
                     "SELECT id FROM job_scores WHERE job_id = $1 AND user_profile_id = $2",
                     score.job_id, profile_id
                 )
@@ -246,16 +240,11 @@ async def main():
             print("No active user profile found. Run: python -m scripts.create_profile")
             return
         
-        # Parse JSONB fields
-        skills = json.loads(profile_row['skills']) if isinstance(profile_row['skills'], str) else profile_row['skills']
-        company_sizes = json.loads(profile_row['preferred_company_sizes']) if isinstance(profile_row['preferred_company_sizes'], str) else profile_row['preferred_company_sizes']
-        industries = json.loads(profile_row['preferred_industries']) if isinstance(profile_row['preferred_industries'], str) else profile_row['preferred_industries']
-        
         user_profile = UserProfile(
             id=profile_row['id'],
             name=profile_row['name'],
             email=profile_row['email'],
-            skills=skills,
+            skills=profile_row['skills'],  # JSONB fields arrive decoded via the pool codec
             years_of_experience=profile_row['years_of_experience'],
             experience_level=profile_row['experience_level'],
             target_salary_min=profile_row['target_salary_min'],
@@ -264,8 +253,8 @@ async def main():
             preferred_location=profile_row['preferred_location'],
             remote_preference=profile_row['remote_preference'],
             willing_to_relocate=profile_row['willing_to_relocate'],
-            preferred_company_sizes=company_sizes,
-            preferred_industries=industries
+            preferred_company_sizes=profile_row['preferred_company_sizes'],
+            preferred_industries=profile_row['preferred_industries']
         )
         
         print(f"\nLoaded profile: {user_profile.name}")
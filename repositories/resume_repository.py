@@ -2,7 +2,7 @@
 Repository for generated resumes database operations
 """
 from typing import Optional, List
-from uuid import UUID
+from uuid import UUID, uuid4
 import asyncpg
 import json
 
@@ -50,6 +50,63 @@ class ResumeRepository:
             )
             return self._row_to_model(row)
     
+    async def create_many(self, resumes: List[GeneratedResumeCreate]) -> List[Optional[GeneratedResume]]:
+        """
+        Create several generated resumes with one connection and two round trips
+        
+        Ids are assigned here so the pipelined executemany (which returns no
+        rows) can be followed by a single fetch of the new rows. A resume whose
+        (user_profile_id, job_id) already has a row (e.g. written by a
+        concurrent run) is skipped instead of failing the whole batch.
+        
+        Returns:
+            The created resumes, in the same order as `resumes`; None for
+            each one that was skipped
+        """
+        if not resumes:
+            return []
+        
+        query = """
+            INSERT INTO generated_resumes (
+                id, user_profile_id, job_id, filename, file_path, file_size_bytes,
+                resume_data, ats_score, keyword_match_rate, matched_keywords,
+                missing_keywords, pdf_data
+            ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12)
+            ON CONFLICT (user_profile_id, job_id) DO NOTHING
+        """
+        
+        ids = [uuid4() for _ in resumes]
+        records = [
+            (
+                resume_id,
+                resume.user_profile_id,
+                resume.job_id,
+                resume.filename,
+                resume.file_path,
+                resume.file_size_bytes,
+                resume.resume_data.model_dump_json(),
+                resume.ats_score,
+                resume.keyword_match_rate,
+                resume.matched_keywords,
+                resume.missing_keywords,
+                resume.pdf_data
+            )
+            for resume_id, resume in zip(ids, resumes)
+        ]
+        
+        async with self.pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.executemany(query, records)
+                rows = await conn.fetch(
+                    "SELECT * FROM generated_resumes WHERE id = ANY($1::uuid[])", ids
+                )
+        
+        by_id = {row['id']: row for row in rows}
+        return [
+            self._row_to_model(by_id[resume_id]) if resume_id in by_id else None
+            for resume_id in ids
+        ]
+    
     async def get_by_id(self, resume_id: UUID) -> Optional[GeneratedResume]:
         """Get resume by ID"""
         query = "SELECT * FROM generated_resumes WHERE id = $1"
@@ -160,8 +217,10 @@ class ResumeRepository:
             SELECT 
                 COUNT(*) as total_resumes,
                 AVG(ats_score) as avg_ats_score,
+                MAX(ats_score) as max_ats_score,
                 AVG(keyword_match_rate) as avg_keyword_match,
                 AVG(file_size_bytes) as avg_file_size,
+                COALESCE(SUM(file_size_bytes), 0) / 1048576.0 as total_size_mb,
                 MIN(created_at) as first_generated,
                 MAX(created_at) as last_generated
             FROM generated_resumes
@@ -173,8 +232,10 @@ class ResumeRepository:
             return {
                 'total_resumes': row['total_resumes'],
                 'avg_ats_score': float(row['avg_ats_score']) if row['avg_ats_score'] else 0,
+                'max_ats_score': float(row['max_ats_score']) if row['max_ats_score'] else 0,
                 'avg_keyword_match': float(row['avg_keyword_match']) if row['avg_keyword_match'] else 0,
                 'avg_file_size_kb': round(row['avg_file_size'] / 1024, 2) if row['avg_file_size'] else 0,
+                'total_size_mb': round(float(row['total_size_mb']), 2),
                 'first_generated': row['first_generated'],
                 'last_generated': row['last_generated']
             }
@@ -198,7 +259,12 @@ class ResumeRepository:
     
     def _row_to_model(self, row: asyncpg.Record) -> GeneratedResume:
         """Convert database row to GeneratedResume model"""
-        resume_data = TailoredResumeData.model_validate_json(row['resume_data'])
+        # Pools with the JSONB codec hand back a dict, plain pools the JSON text
+        resume_data = row['resume_data']
+        if isinstance(resume_data, str):
+            resume_data = TailoredResumeData.model_validate_json(resume_data)
+        else:
+            resume_data = TailoredResumeData.model_validate(resume_data)
         
         return GeneratedResume(
             id=row['id'],
@@ -0,0 +1,146 @@
+"""
+Sample data shared by the test scripts
+"""
+from functools import lru_cache
+
+from models.resume import BaseResume, WorkExperience, Education, Project
+
+
+@lru_cache(maxsize=1)
+def get_sample_base_resume() -> BaseResume:
+    """
+    Sample base resume for testing
+    
+    Built once per process; callers share the instance and must not mutate it.
+    """
+    
+    return BaseResume(
+        full_name="Puja Shrestha",
+        email="puja@example.com",
+        phone="+1 (555) 123-4567",
+        location="Barrie, Ontario, Canada",
+        linkedin="linkedin.com/in/pujashrestha",
+        github="github.com/pujashrestha",
+        
+        summary="""Experienced software engineer with strong expertise in machine learning, 
+        artificial intelligence, and full-stack development. Proven track record of building 
+        scalable AI systems and delivering high-impact solutions. Passionate about leveraging 
+        cutting-edge technology to solve real-world problems.""",
+        
+        technical_skills={
+            "Languages": ["Python", "JavaScript", "TypeScript", "SQL"],
+            "AI/ML": ["Machine Learning", "Deep Learning", "NLP", "PyTorch", "TensorFlow", "LLM", "RAG", "AI Agents"],
+            "Frameworks": ["FastAPI", "React", "Angular.js", "Node.js", "Django", "Flask"],
+            "Cloud & DevOps": ["AWS", "Docker", "PostgreSQL", "Redis", "Kubernetes"],
+            "Tools": ["Git", "REST APIs", "CI/CD", "Prompt Engineering"]
+        },
+        
+        work_experience=[
+            WorkExperience(
+                company="Tech Innovations Inc.",
+                position="Machine Learning Engineer",
+                location="Toronto, ON",
+                start_date="Jan 2022",
+                end_date="Present",
+                description="Lead ML engineer developing AI-powered solutions including LLM applications, RAG systems, and AI agents for enterprise clients",
+                achievements=[
+                    "Built and deployed 5+ machine learning models serving 100K+ daily users",
+                    "Developed AI agents and multi-agent systems for workflow automation",
+                    "Implemented RAG pipelines for context-aware LLM applications",
+                    "Improved model accuracy by 25% through advanced feature engineering",
+                    "Reduced inference latency by 40% using model optimization techniques",
+                    "Mentored 3 junior engineers in ML best practices"
+                ],
+                technologies=["Python", "PyTorch", "TensorFlow", "LLM", "RAG", "AI Agents", "AWS", "Docker", "FastAPI"]
+            ),
+            WorkExperience(
+                company="DataCorp Solutions",
+                position="Software Engineer",
+                location="Remote",
+                start_date="Jun 2020",
+                end_date="Dec 2021",
+                description="Full-stack engineer building data-intensive web applications and automation solutions",
+                achievements=[
+                    "Developed RESTful APIs serving 50K+ requests per day",
+                    "Designed and implemented PostgreSQL database schemas for high-performance queries",
+                    "Built responsive React dashboards for data visualization",
+                    "Implemented CI/CD pipelines reducing deployment time by 60%",
+                    "Created automation tools using Python and Docker"
+                ],
+                technologies=["JavaScript", "React", "Node.js", "PostgreSQL", "Python", "AWS", "Docker", "REST APIs"]
+            ),
+            WorkExperience(
+                company="Startup Labs",
+                position="Junior Developer",
+                location="Barrie, ON",
+                start_date="Jan 2019",
+                end_date="May 2020",
+                description="Software developer working on web applications, automation tools, and generative AI prototypes",
+                achievements=[
+                    "Developed automation scripts reducing manual work by 70%",
+                    "Built internal tools used by 20+ team members daily",
+                    "Experimented with generative AI for content creation",
+                    "Collaborated with cross-functional teams in Agile environment"
+                ],
+                technologies=["Python", "Django", "JavaScript", "MongoDB", "Generative AI"]
+            )
+        ],
+        
+        education=[
+            Education(
+                institution="University of Toronto",
+                degree="Bachelor of Science",
+                field_of_study="Computer Science",
+                location="Toronto, ON",
+                graduation_date="May 2018",
+                gpa=3.7,
+                honors=["Dean's List", "Academic Excellence Award"],
+                relevant_coursework=[
+                    "Machine Learning",
+                    "Artificial Intelligence",
+                    "Data Structures & Algorithms",
+                    "Database Systems"
+                ]
+            )
+        ],
+        
+        projects=[
+            Project(
+                name="AI Job Application Assistant",
+                description="Multi-agent AI system that automates job searching, resume tailoring, and application tracking using LLMs, RAG, and semantic search",
+                technologies=["Python", "LLM", "RAG", "AI Agents", "PostgreSQL", "FastAPI", "OpenAI"],
+                achievements=[
+                    "Implemented semantic job matching with 85% accuracy",
+                    "Automated resume generation for 100+ applications",
+                    "Reduced job search time by 80%"
+                ],
+                date="2024"
+            ),
+            Project(
+                name="Real-time Sentiment Analysis Platform",
+                description="Built a scalable system for analyzing social media sentiment using deep learning and transformers",
+                technologies=["Python", "PyTorch", "BERT", "NLP", "Redis", "Docker", "AWS"],
+                achievements=[
+                    "Processed 1M+ tweets per day with 92% accuracy",
+                    "Deployed using microservices architecture",
+                    "Implemented real-time dashboard for insights"
+                ],
+                date="2023"
+            ),
+            Project(
+                name="Smart Recommendation Engine",
+                description="Collaborative filtering system for personalized product recommendations using machine learning",
+                technologies=["Python", "TensorFlow", "Machine Learning", "PostgreSQL", "FastAPI"],
+                achievements=[
+                    "Increased click-through rate by 35%",
+                    "Served 10K+ recommendations per minute"
+                ],
+                date="2022"
+            )
+        ],
+        
+        certifications=[],
+        publications=[],
+        awards=[],
+        volunteer=[]
+    )
@@ -3,156 +3,48 @@ Test Resume Tailoring Across All Jobs
 Generate tailored resumes for all scored jobs and analyze results
 """
 import asyncio
+import heapq
 import sys
 import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Repo root is already on sys.path under `python -m scripts.<name>`; only
+# add it when the script is run by path
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
 
 from database.connection import Database
 from services.resume_tailoring import ResumeTailoringService
-from models.resume import BaseResume, WorkExperience, Education, Project
 from models.user_profile import UserProfile
 from models.job import Job
-import json
+from scripts.fixtures import get_sample_base_resume
 import logging
+import orjson
+from pathlib import Path
 from typing import List, Dict
 
 logging.basicConfig(level=logging.WARNING)  # Reduce noise
 logger = logging.getLogger(__name__)
 
+# Max tailoring calls in flight at once
+TAILORING_CONCURRENCY = 8
 
-def create_sample_base_resume() -> BaseResume:
-    """Create a sample base resume for testing"""
-    
-    return BaseResume(
-        full_name="Puja Shrestha",
-        email="puja@example.com",
-        phone="+1 (555) 123-4567",
-        location="Barrie, Ontario, Canada",
-        linkedin="linkedin.com/in/pujashrestha",
-        github="github.com/pujashrestha",
-        
-        summary="""Experienced software engineer with strong expertise in machine learning, 
-        artificial intelligence, and full-stack development. Proven track record of building 
-        scalable AI systems and delivering high-impact solutions. Passionate about leveraging 
-        cutting-edge technology to solve real-world problems.""",
-        
-        technical_skills={
-            "Languages": ["Python", "JavaScript", "TypeScript", "SQL"],
-            "AI/ML": ["Machine Learning", "Deep Learning", "NLP", "PyTorch", "TensorFlow", "LLM", "RAG", "AI Agents"],
-            "Frameworks": ["FastAPI", "React", "Angular.js", "Node.js", "Django", "Flask"],
-            "Cloud & DevOps": ["AWS", "Docker", "PostgreSQL", "Redis", "Kubernetes"],
-            "Tools": ["Git", "REST APIs", "CI/CD", "Prompt Engineering"]
-        },
-        
-        work_experience=[
-            WorkExperience(
-                company="Tech Innovations Inc.",
-                position="Machine Learning Engineer",
-                location="Toronto, ON",
-                start_date="Jan 2022",
-                end_date="Present",
-                description="Lead ML engineer developing AI-powered solutions including LLM applications, RAG systems, and AI agents for enterprise clients",
-                achievements=[
-                    "Built and deployed 5+ machine learning models serving 100K+ daily users",
-                    "Developed AI agents and multi-agent systems for workflow automation",
-                    "Implemented RAG pipelines for context-aware LLM applications",
-                    "Improved model accuracy by 25% through advanced feature engineering",
-                    "Reduced inference latency by 40% using model optimization techniques",
-                    "Mentored 3 junior engineers in ML best practices"
-                ],
-                technologies=["Python", "PyTorch", "TensorFlow", "LLM", "RAG", "AI Agents", "AWS", "Docker", "FastAPI"]
-            ),
-            WorkExperience(
-                company="DataCorp Solutions",
-                position="Software Engineer",
-                location="Remote",
-                start_date="Jun 2020",
-                end_date="Dec 2021",
-                description="Full-stack engineer building data-intensive web applications and automation solutions",
-                achievements=[
-                    "Developed RESTful APIs serving 50K+ requests per day",
-                    "Designed and implemented PostgreSQL database schemas for high-performance queries",
-                    "Built responsive React dashboards for data visualization",
-                    "Implemented CI/CD pipelines reducing deployment time by 60%",
-                    "Created automation tools using Python and Docker"
-                ],
-                technologies=["JavaScript", "React", "Node.js", "PostgreSQL", "Python", "AWS", "Docker", "REST APIs"]
-            ),
-            WorkExperience(
-                company="Startup Labs",
-                position="Junior Developer",
-                location="Barrie, ON",
-                start_date="Jan 2019",
-                end_date="May 2020",
-                description="Software developer working on web applications, automation tools, and generative AI prototypes",
-                achievements=[
-                    "Developed automation scripts reducing manual work by 70%",
-                    "Built internal tools used by 20+ team members daily",
-                    "Experimented with generative AI for content creation",
-                    "Collaborated with cross-functional teams in Agile environment"
-                ],
-                technologies=["Python", "Django", "JavaScript", "MongoDB", "Generative AI"]
-            )
-        ],
-        
-        education=[
-            Education(
-                institution="University of Toronto",
-                degree="Bachelor of Science",
-                field_of_study="Computer Science",
-                location="Toronto, ON",
-                graduation_date="May 2018",
-                gpa=3.7,
-                honors=["Dean's List", "Academic Excellence Award"],
-                relevant_coursework=[
-                    "Machine Learning",
-                    "Artificial Intelligence",
-                    "Data Structures & Algorithms",
-                    "Database Systems"
-                ]
-            )
-        ],
-        
-        projects=[
-            Project(
-                name="AI Job Application Assistant",
-                description="Multi-agent AI system that automates job searching, resume tailoring, and application tracking using LLMs, RAG, and semantic search",
-                technologies=["Python", "LLM", "RAG", "AI Agents", "PostgreSQL", "FastAPI", "OpenAI"],
-                achievements=[
-                    "Implemented semantic job matching with 85% accuracy",
-                    "Automated resume generation for 100+ applications",
-                    "Reduced job search time by 80%"
-                ],
-                date="2024"
-            ),
-            Project(
-                name="Real-time Sentiment Analysis Platform",
-                description="Built a scalable system for analyzing social media sentiment using deep learning and transformers",
-                technologies=["Python", "PyTorch", "BERT", "NLP", "Redis", "Docker", "AWS"],
-                achievements=[
-                    "Processed 1M+ tweets per day with 92% accuracy",
-                    "Deployed using microservices architecture",
-                    "Implemented real-time dashboard for insights"
-                ],
-                date="2023"
-            ),
-            Project(
-                name="Smart Recommendation Engine",
-                description="Collaborative filtering system for personalized product recommendations using machine learning",
-                technologies=["Python", "TensorFlow", "Machine Learning", "PostgreSQL", "FastAPI"],
-                achievements=[
-                    "Increased click-through rate by 35%",
-                    "Served 10K+ recommendations per minute"
-                ],
-                date="2022"
-            )
-        ],
-        
-        certifications=[],
-        publications=[],
-        awards=[],
-        volunteer=[]
-    )
+# ATS analysis workers, and how many tailored resumes may wait for them
+ATS_WORKERS = 2
+ATS_QUEUE_SIZE = 32
+
+# Each tailored resume + ATS result is written here as soon as it's ready
+OUTPUT_DIR = Path("./generated_resumes/tailored")
+
+
+def _write_result(path: Path, tailored_resume, ats_result):
+    path.write_bytes(orjson.dumps({
+        'tailored_resume': tailored_resume.model_dump(mode='json'),
+        'ats_result': ats_result.model_dump(mode='json')
+    }))
+
+
+def _load_result(path: Path) -> Dict:
+    return orjson.loads(path.read_bytes())
 
 
 async def test_all_jobs():
@@ -162,30 +54,40 @@ async def test_all_jobs():
     await db.connect()
     
     try:
-        # 1. Load user profile
-        profile_row = await db.fetchrow("""
-            SELECT 
-                id, name, email, skills, years_of_experience, experience_level,
-                target_salary_min, target_salary_max, target_salary_currency,
-                preferred_location, remote_preference, willing_to_relocate,
-                preferred_company_sizes, preferred_industries
-            FROM user_profile
-            WHERE is_active = TRUE
-            LIMIT 1
-        """)
+        # 1-2. Load user profile and all scored jobs concurrently (two pooled connections)
+        profile_row, job_rows = await asyncio.gather(
+            db.fetchrow("""
+                SELECT 
+                    id, name, email, skills, years_of_experience, experience_level,
+                    target_salary_min, target_salary_max, target_salary_currency,
+                    preferred_location, remote_preference, willing_to_relocate,
+                    preferred_company_sizes, preferred_industries
+                FROM user_profile
+                WHERE is_active = TRUE
+                LIMIT 1
+            """),
+            db.fetch("""
+                SELECT 
+                    j.id, j.title, j.company, j.location, j.location_type,
+                    j.employment_type, j.salary_min, j.salary_max, 
+                    j.salary_currency, j.salary_period, j.description,
+                    j.platform, j.platform_url, j.posted_date, j.skills,
+                    js.total_score
+                FROM jobs j
+                INNER JOIN job_scores js ON j.id = js.job_id
+                ORDER BY js.total_score DESC
+            """)
+        )
         
         if not profile_row:
             print("No active user profile found. Run: python -m scripts.create_profile")
             return
         
-        # Parse profile
-        skills = json.loads(profile_row['skills']) if isinstance(profile_row['skills'], str) else profile_row['skills']
-        
         user_profile = UserProfile(
             id=profile_row['id'],
             name=profile_row['name'],
             email=profile_row['email'],
-            skills=skills,
+            skills=profile_row['skills'],
             years_of_experience=profile_row['years_of_experience'],
             experience_level=profile_row['experience_level'],
             target_salary_min=profile_row['target_salary_min'],
@@ -196,19 +98,6 @@ async def test_all_jobs():
         
         print(f"Loaded profile: {user_profile.name}")
         
-        # 2. Load all scored jobs
-        job_rows = await db.fetch("""
-            SELECT 
-                j.id, j.title, j.company, j.location, j.location_type,
-                j.employment_type, j.salary_min, j.salary_max, 
-                j.salary_currency, j.salary_period, j.description,
-                j.platform, j.platform_url, j.posted_date, j.skills,
-                js.total_score
-            FROM jobs j
-            INNER JOIN job_scores js ON j.id = js.job_id
-            ORDER BY js.total_score DESC
-        """)
-        
         if not job_rows:
             print("No scored jobs found. Run: python main.py && python -m orchestrators.job_scorer")
             return
@@ -216,19 +105,15 @@ async def test_all_jobs():
         print(f"Found {len(job_rows)} scored jobs\n")
         
         # 3. Create base resume
-        base_resume = create_sample_base_resume()
+        base_resume = get_sample_base_resume()
         tailoring_service = ResumeTailoringService()
         
         # 4. Test tailoring on each job
-        results = []
-        
-        print("🔄 Testing resume tailoring on all jobs...\n")
-        
-        for i, job_row in enumerate(job_rows, 1):
-            # Parse job
-            job_skills = json.loads(job_row['skills']) if isinstance(job_row['skills'], str) else job_row['skills']
-            
-            job = Job(
+        # Rows in `jobs` were written from validated Job models, so skip
+        # re-running the validators for every row
+        jobs = []
+        for job_row in job_rows:
+            jobs.append(Job.model_construct(
                 id=str(job_row['id']),
                 title=job_row['title'],
                 company=job_row['company'],
@@ -240,133 +125,198 @@ async def test_all_jobs():
                 description=job_row['description'],
                 platform=job_row['platform'],
                 platform_url=job_row['platform_url'],
-                skills=job_skills if isinstance(job_skills, list) else []
-            )
-            
-            # Tailor resume
-            tailored_resume = await tailoring_service.tailor_resume(
+                skills=job_row['skills'] or []  # JSONB arrives decoded via the pool codec
+            ))
+        
+        print("🔄 Testing resume tailoring on all jobs...\n")
+        
+        # Report each job as soon as it's tailored. Full results go straight to
+        # disk; only a compact per-job tuple stays in memory for the summary:
+        # (index, ats_score, keyword_match_rate, missing_count, experience_count)
+        OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+        result_paths = [OUTPUT_DIR / f"{job.id}.json" for job in jobs]
+        results = []
+        
+        # Two overlapping stages: tailoring feeds a bounded queue that the ATS
+        # workers drain, so ATS analysis and disk writes run while later jobs
+        # are still being tailored. None tells a worker to stop.
+        tailored_q: asyncio.Queue = asyncio.Queue(maxsize=ATS_QUEUE_SIZE)
+        
+        async def tailor_stage():
+            async for item in tailoring_service.tailor_resume_stream(
                 base_resume=base_resume,
-                job=job,
-                user_profile=user_profile
-            )
-            
-            # Analyze ATS
-            ats_result = tailoring_service.analyze_ats_compatibility(tailored_resume, job)
-            
-            results.append({
-                'job': job,
-                'job_score': job_row['total_score'],
-                'tailored_resume': tailored_resume,
-                'ats_result': ats_result
-            })
+                jobs=jobs,
+                user_profile=user_profile,
+                max_concurrency=TAILORING_CONCURRENCY
+            ):
+                await tailored_q.put(item)
+            for _ in range(ATS_WORKERS):
+                await tailored_q.put(None)
+        
+        async def ats_worker():
+            while (item := await tailored_q.get()) is not None:
+                index, tailored_resume = item
+                job = jobs[index]
+                
+                # Analyze ATS (CPU-only)
+                ats_result = await asyncio.to_thread(
+                    tailoring_service.analyze_ats_compatibility, tailored_resume, job
+                )
+                
+                await asyncio.to_thread(_write_result, result_paths[index], tailored_resume, ats_result)
+                
+                results.append((
+                    index,
+                    ats_result.ats_score,
+                    ats_result.keyword_match_rate,
+                    len(ats_result.missing_keywords),
+                    len(tailored_resume.relevant_experience)
+                ))
+                
+                # Quick progress indicator, flushed every 10 jobs
+                sys.stdout.write(f"[{index + 1}/{len(job_rows)}] {job.title[:50]:<50} | ATS: {ats_result.ats_score:>5.1f}/100 | Keywords: {ats_result.keyword_match_rate*100:>5.1f}%\n")
+                if len(results) % 10 == 0:
+                    sys.stdout.flush()
+        
+        await asyncio.gather(tailor_stage(), *(ats_worker() for _ in range(ATS_WORKERS)))
+        
+        # Restore job order for the summary sections
+        results.sort()
+        
+        # 5. Display summary (built up and written to stdout in one go)
+        lines: List[str] = []
+        lines.append("\n" + "="*100)
+        lines.append("RESUME TAILORING SUMMARY")
+        lines.append("="*100)
+        
+        # Single pass over results for every summary / issue statistic
+        sum_ats = 0.0
+        sum_keyword_match = 0.0
+        ats_buckets = [0, 0, 0, 0]  # poor, moderate, good, perfect
+        low_ats = []
+        many_missing = []
+        no_exp = []
+        
+        for r in results:
+            index, score, keyword_match, missing_count, experience_count = r
+            sum_ats += score
+            sum_keyword_match += keyword_match
+            ats_buckets[0 if score < 60 else 1 if score < 80 else 2 if score < 95 else 3] += 1
             
-            # Quick progress indicator
-            print(f"[{i}/{len(job_rows)}] {job.title[:50]:<50} | ATS: {ats_result.ats_score:>5.1f}/100 | Keywords: {ats_result.keyword_match_rate*100:>5.1f}%")
-        
-        # 5. Display summary
-        print("\n" + "="*100)
-        print("RESUME TAILORING SUMMARY")
-        print("="*100)
-        
-        avg_ats = sum(r['ats_result'].ats_score for r in results) / len(results)
-        avg_keyword_match = sum(r['ats_result'].keyword_match_rate for r in results) / len(results)
-        
-        perfect_ats = sum(1 for r in results if r['ats_result'].ats_score >= 95)
-        good_ats = sum(1 for r in results if 80 <= r['ats_result'].ats_score < 95)
-        moderate_ats = sum(1 for r in results if 60 <= r['ats_result'].ats_score < 80)
-        poor_ats = sum(1 for r in results if r['ats_result'].ats_score < 60)
-        
-        print(f"\nOverall Statistics:")
-        print(f"  Total Jobs:           {len(results)}")
-        print(f"  Average ATS Score:    {avg_ats:.1f}/100")
-        print(f"  Average Keyword Match: {avg_keyword_match*100:.1f}%")
-        print(f"\nATS Score Distribution:")
-        print(f"  🟢 Perfect (95-100):  {perfect_ats} jobs")
-        print(f"  🟡 Good (80-94):      {good_ats} jobs")
-        print(f"  🟠 Moderate (60-79):  {moderate_ats} jobs")
-        print(f"  🔴 Poor (<60):        {poor_ats} jobs")
+            if score < 70:
+                low_ats.append(r)
+            if missing_count > 5:
+                many_missing.append(r)
+            if experience_count == 0:
+                no_exp.append(r)
+        
+        avg_ats = sum_ats / len(results)
+        avg_keyword_match = sum_keyword_match / len(results)
+        poor_ats, moderate_ats, good_ats, perfect_ats = ats_buckets
+        
+        lines.append(f"\nOverall Statistics:")
+        lines.append(f"  Total Jobs:           {len(results)}")
+        lines.append(f"  Average ATS Score:    {avg_ats:.1f}/100")
+        lines.append(f"  Average Keyword Match: {avg_keyword_match*100:.1f}%")
+        lines.append(f"\nATS Score Distribution:")
+        lines.append(f"  🟢 Perfect (95-100):  {perfect_ats} jobs")
+        lines.append(f"  🟡 Good (80-94):      {good_ats} jobs")
+        lines.append(f"  🟠 Moderate (60-79):  {moderate_ats} jobs")
+        lines.append(f"  🔴 Poor (<60):        {poor_ats} jobs")
         
         # 6. Show top 3 best matches
-        print("\n" + "="*100)
-        print("🏆 TOP 3 BEST TAILORED RESUMES")
-        print("="*100)
-        
-        results_sorted = sorted(results, key=lambda x: x['ats_result'].ats_score, reverse=True)
-        
-        for i, result in enumerate(results_sorted[:3], 1):
-            job = result['job']
-            tailored = result['tailored_resume']
-            ats = result['ats_result']
+        lines.append("\n" + "="*100)
+        lines.append("🏆 TOP 3 BEST TAILORED RESUMES")
+        lines.append("="*100)
+        
+        def by_ats(r):
+            return r[1]
+        
+        # Only the handful of results shown in detail are read back from disk
+        for i, (index, *_) in enumerate(heapq.nlargest(3, results, key=by_ats), 1):
+            job = jobs[index]
+            saved = _load_result(result_paths[index])
+            tailored = saved['tailored_resume']
+            ats = saved['ats_result']
             
-            print(f"\n{i}. {job.title} at {job.company}")
-            print(f"   Job Score:     {result['job_score']:.1f}/100")
-            print(f"   ATS Score:     {ats.ats_score:.1f}/100")
-            print(f"   Keyword Match: {ats.keyword_match_rate*100:.1f}%")
-            print(f"   Strategy:      {tailored.tailoring_strategy}")
-            print(f"   Summary:       {tailored.tailored_summary[:100]}...")
-            print(f"   Top Skills:    {', '.join(tailored.highlighted_skills[:5])}")
-            print(f"   Experience:    {len(tailored.relevant_experience)} positions selected")
-            print(f"   Projects:      {len(tailored.relevant_projects)} projects selected")
+            lines.append(f"\n{i}. {job.title} at {job.company}")
+            lines.append(f"   Job Score:     {job_rows[index]['total_score']:.1f}/100")
+            lines.append(f"   ATS Score:     {ats['ats_score']:.1f}/100")
+            lines.append(f"   Keyword Match: {ats['keyword_match_rate']*100:.1f}%")
+            lines.append(f"   Strategy:      {tailored['tailoring_strategy']}")
+            lines.append(f"   Summary:       {tailored['tailored_summary'][:100]}...")
+            lines.append(f"   Top Skills:    {', '.join(tailored['highlighted_skills'][:5])}")
+            lines.append(f"   Experience:    {len(tailored['relevant_experience'])} positions selected")
+            lines.append(f"   Projects:      {len(tailored['relevant_projects'])} projects selected")
         
         # 7. Show bottom 3 (needs improvement)
         if len(results) > 3:
-            print("\n" + "="*100)
-            print(" BOTTOM 3 - NEEDS IMPROVEMENT")
-            print("="*100)
+            lines.append("\n" + "="*100)
+            lines.append(" BOTTOM 3 - NEEDS IMPROVEMENT")
+            lines.append("="*100)
             
-            for i, result in enumerate(results_sorted[-3:], 1):
-                job = result['job']
-                ats = result['ats_result']
+            # Worst first
+            for i, (index, *_) in enumerate(heapq.nsmallest(3, results, key=by_ats), 1):
+                job = jobs[index]
+                ats = _load_result(result_paths[index])['ats_result']
                 
-                print(f"\n{i}. {job.title} at {job.company}")
-                print(f"   ATS Score:        {ats.ats_score:.1f}/100")
-                print(f"   Keyword Match:    {ats.keyword_match_rate*100:.1f}%")
-                print(f"   Missing Keywords: {', '.join(ats.missing_keywords[:5])}")
-                if ats.suggestions:
-                    print(f"   Suggestions:      {ats.suggestions[0]}")
+                lines.append(f"\n{i}. {job.title} at {job.company}")
+                lines.append(f"   ATS Score:        {ats['ats_score']:.1f}/100")
+                lines.append(f"   Keyword Match:    {ats['keyword_match_rate']*100:.1f}%")
+                lines.append(f"   Missing Keywords: {', '.join(ats['missing_keywords'][:5])}")
+                if ats['suggestions']:
+                    lines.append(f"   Suggestions:      {ats['suggestions'][0]}")
         
         # 8. Edge cases and issues
-        print("\n" + "="*100)
-        print("🔍 EDGE CASES & ISSUES")
-        print("="*100)
+        lines.append("\n" + "="*100)
+        lines.append("🔍 EDGE CASES & ISSUES")
+        lines.append("="*100)
         
         issues_found = False
         
         # Check for low ATS scores
-        low_ats = [r for r in results if r['ats_result'].ats_score < 70]
         if low_ats:
             issues_found = True
-            print(f"\n {len(low_ats)} jobs with ATS score < 70:")
-            for r in low_ats[:3]:
-                print(f"   - {r['job'].title}: {r['ats_result'].ats_score:.1f}/100")
-                print(f"     Missing: {', '.join(r['ats_result'].missing_keywords[:3])}")
+            lines.append(f"\n {len(low_ats)} jobs with ATS score < 70:")
+            for index, score, *_ in low_ats[:3]:
+                missing = _load_result(result_paths[index])['ats_result']['missing_keywords']
+                lines.append(f"   - {jobs[index].title}: {score:.1f}/100")
+                lines.append(f"     Missing: {', '.join(missing[:3])}")
         
         # Check for jobs with many missing keywords
-        many_missing = [r for r in results if len(r['ats_result'].missing_keywords) > 5]
         if many_missing:
             issues_found = True
-            print(f"\n {len(many_missing)} jobs with >5 missing keywords:")
-            for r in many_missing[:3]:
-                print(f"   - {r['job'].title}: {len(r['ats_result'].missing_keywords)} missing")
+            lines.append(f"\n {len(many_missing)} jobs with >5 missing keywords:")
+            for index, _, _, missing_count, _ in many_missing[:3]:
+                lines.append(f"   - {jobs[index].title}: {missing_count} missing")
         
         # Check for jobs with no experience selected
-        no_exp = [r for r in results if len(r['tailored_resume'].relevant_experience) == 0]
         if no_exp:
             issues_found = True
-            print(f"\n {len(no_exp)} jobs with no relevant experience selected:")
-            for r in no_exp:
-                print(f"   - {r['job'].title}")
+            lines.append(f"\n {len(no_exp)} jobs with no relevant experience selected:")
+            for index, *_ in no_exp:
+                lines.append(f"   - {jobs[index].title}")
         
         if not issues_found:
-            print("\n No significant issues found!")
+            lines.append("\n No significant issues found!")
+        
+        lines.append("\n" + "="*100)
+        lines.append("Resume tailoring test completed!")
+        lines.append("="*100)
         
-        print("\n" + "="*100)
-        print("Resume tailoring test completed!")
-        print("="*100)
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
         
     finally:
         await db.disconnect()
 
 
 if __name__ == "__main__":
+    # uvloop is optional (not available on Windows); fall back to the default loop
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
     asyncio.run(test_all_jobs())
\ No newline at end of file
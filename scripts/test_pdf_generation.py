@@ -5,14 +5,18 @@ Test the PDF generation service with one job
 import asyncio
 import sys
 import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Repo root is already on sys.path under `python -m scripts.<name>`; only
+# add it when the script is run by path
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
 
 from database.connection import Database
 from services.pdf_generator import PDFGenerator, ResumePDFService
 from services.resume_tailoring import ResumeTailoringService
-from models.resume import BaseResume, WorkExperience, Education, Project
 from models.user_profile import UserProfile
 from models.job import Job
+from scripts.fixtures import get_sample_base_resume
 from repositories.job_repository import JobRepository
 from repositories.user_profile_repository import UserProfileRepository
 
@@ -23,95 +27,6 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-def create_sample_base_resume() -> BaseResume:
-    """Create sample base resume"""
-    
-    return BaseResume(
-        full_name="Puja Shrestha",
-        email="puja@example.com",
-        phone="+1 (555) 123-4567",
-        location="Barrie, Ontario, Canada",
-        linkedin="linkedin.com/in/pujashrestha",
-        github="github.com/pujashrestha",
-        
-        summary="""Experienced software engineer with 3+ years of expertise in machine learning, 
-        artificial intelligence, and full-stack development. Proven track record of building 
-        scalable AI systems and delivering high-impact solutions.""",
-        
-        technical_skills={
-            "programming_languages": ["Python", "JavaScript", "TypeScript", "SQL"],
-            "ai_ml_frameworks": ["PyTorch", "TensorFlow", "scikit-learn"],
-            "llm_frameworks": ["LangChain", "OpenAI API"],
-            "ai_techniques": ["Machine Learning", "Deep Learning", "NLP", "RAG", "AI Agents"],
-            "web_frameworks": ["Angular.js", "Node.js", "FastAPI"],
-            "databases": ["PostgreSQL", "MongoDB", "Redis"],
-            "cloud_devops": ["AWS", "Docker", "Git"]
-        },
-        
-        work_experience=[
-            WorkExperience(
-                company="Tech Innovations Inc.",
-                position="AI/ML Engineer",
-                location="Toronto, ON",
-                start_date="Jan 2022",
-                end_date=None,
-                description="Leading development of AI-powered solutions",
-                achievements=[
-                    "Built and deployed 5+ production ML models serving 100K+ daily users",
-                    "Reduced model inference time by 60% through optimization",
-                    "Implemented RAG system improving accuracy by 40%",
-                    "Led team of 3 engineers in multi-agent framework development"
-                ],
-                technologies=["Python", "PyTorch", "LangChain", "PostgreSQL", "AWS"]
-            ),
-            WorkExperience(
-                company="Digital Solutions Corp",
-                position="Full Stack Developer",
-                location="Remote",
-                start_date="Jun 2020",
-                end_date="Dec 2021",
-                description="Developed scalable web applications and APIs",
-                achievements=[
-                    "Architected microservices backend handling 1M+ API requests daily",
-                    "Built real-time analytics dashboard using Angular and Node.js",
-                    "Improved application performance by 45% through optimization"
-                ],
-                technologies=["JavaScript", "Node.js", "Angular", "MongoDB"]
-            )
-        ],
-        
-        education=[
-            Education(
-                institution="University of Toronto",
-                degree="Bachelor of Science",
-                field_of_study="Computer Science",
-                location="Toronto, ON",
-                graduation_date="May 2020",
-                gpa=3.8,
-                honors=["Dean's List", "Graduated with Distinction"],
-                relevant_coursework=[
-                    "Machine Learning", "Artificial Intelligence", "Database Systems"
-                ]
-            )
-        ],
-        
-        projects=[
-            Project(
-                name="Multi-Agent Job Application System",
-                description="AI-powered system that automates job search and application",
-                technologies=["Python", "LangChain", "PostgreSQL", "OpenAI"],
-                achievements=[
-                    "Implemented semantic job matching with 80% accuracy",
-                    "Built ATS-optimized resume generation with 100% compatibility"
-                ],
-                date="2024 - Present"
-            )
-        ],
-        
-        certifications=[]
-    )
-
-
 async def test_pdf_generation():
     """Test PDF generation for a single job"""
     
@@ -149,7 +64,7 @@ async def test_pdf_generation():
         print()
         
         # Create base resume
-        base_resume = create_sample_base_resume()
+        base_resume = get_sample_base_resume()
         print("✓ Created sample base resume")
         
         # Initialize services
@@ -223,4 +138,11 @@ async def test_pdf_generation():
 
 
 if __name__ == "__main__":
+    # uvloop is optional (not available on Windows); fall back to the default loop
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
     asyncio.run(test_pdf_generation())
\ No newline at end of file
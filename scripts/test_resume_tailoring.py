@@ -4,22 +4,31 @@ Test Resume Tailoring Service
 import asyncio
 import sys
 import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from functools import lru_cache
+# Repo root is already on sys.path under `python -m scripts.<name>`; only
+# add it when the script is run by path
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
 
-from database.connection import Database
+from services.database import db
 from services.resume_tailoring import ResumeTailoringService
 from models.resume import BaseResume, WorkExperience, Education, Project
 from models.user_profile import UserProfile
 from models.job import Job
-import json
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1)
 def create_sample_base_resume() -> BaseResume:
-    """Create a sample base resume for testing"""
+    """
+    Create a sample base resume for testing
+    
+    Built once per process; callers share the instance and must not mutate it.
+    """
     
     return BaseResume(
         full_name="Puja Shrestha",
@@ -152,34 +161,47 @@ def create_sample_base_resume() -> BaseResume:
 async def test_resume_tailoring():
     """Test the resume tailoring service"""
     
-    db = Database()
     await db.connect()
     
     try:
-        # 1. Load user profile
-        profile_row = await db.fetchrow("""
-            SELECT 
-                id, name, email, skills, years_of_experience, experience_level,
-                target_salary_min, target_salary_max, target_salary_currency,
-                preferred_location, remote_preference, willing_to_relocate,
-                preferred_company_sizes, preferred_industries
-            FROM user_profile
-            WHERE is_active = TRUE
-            LIMIT 1
+        # 1-2. Load the user profile and the best-scored job in one round-trip
+        # (each comes back as a JSONB object, decoded by the pool codec)
+        row = await db.fetchrow("""
+            WITH profile AS (
+                SELECT 
+                    id, name, email, skills, years_of_experience, experience_level,
+                    target_salary_min, target_salary_max, target_salary_currency,
+                    preferred_location, remote_preference, willing_to_relocate,
+                    preferred_company_sizes, preferred_industries
+                FROM user_profile
+                WHERE is_active = TRUE
+                LIMIT 1
+            ), top_job AS (
+                SELECT 
+                    j.id, j.title, j.company, j.location, j.location_type,
+                    j.employment_type, j.salary_min, j.salary_max, 
+                    j.salary_currency, j.salary_period, j.description,
+                    j.platform, j.platform_url, j.posted_date, j.skills
+                FROM jobs j
+                INNER JOIN job_scores js ON j.id = js.job_id
+                ORDER BY js.total_score DESC
+                LIMIT 1
+            )
+            SELECT
+                (SELECT to_jsonb(profile) FROM profile) AS profile,
+                (SELECT to_jsonb(top_job) FROM top_job) AS job
         """)
+        profile_row = row['profile']
         
         if not profile_row:
             print("No active user profile found. Run: python -m scripts.create_profile")
             return
         
-        # Parse profile
-        skills = json.loads(profile_row['skills']) if isinstance(profile_row['skills'], str) else profile_row['skills']
-        
         user_profile = UserProfile(
             id=profile_row['id'],
             name=profile_row['name'],
             email=profile_row['email'],
-            skills=skills,
+            skills=profile_row['skills'],  # nested JSONB, already a list
             years_of_experience=profile_row['years_of_experience'],
             experience_level=profile_row['experience_level'],
             target_salary_min=profile_row['target_salary_min'],
@@ -190,25 +212,13 @@ async def test_resume_tailoring():
         
         print(f"\n Loaded profile: {user_profile.name}")
         
-        # 2. Load a job with good score
-        job_row = await db.fetchrow("""
-            SELECT 
-                j.id, j.title, j.company, j.location, j.location_type,
-                j.employment_type, j.salary_min, j.salary_max, 
-                j.salary_currency, j.salary_period, j.description,
-                j.platform, j.platform_url, j.posted_date, j.skills
-            FROM jobs j
-            INNER JOIN job_scores js ON j.id = js.job_id
-            ORDER BY js.total_score DESC
-            LIMIT 1
-        """)
+        job_row = row['job']
         
         if not job_row:
             print("No scored jobs found. Run: python main.py && python -m orchestrators.job_scorer")
             return
         
-        # Parse job
-        job_skills = json.loads(job_row['skills']) if isinstance(job_row['skills'], str) else job_row['skills']
+        job_skills = job_row['skills']  # nested JSONB, already a list (or None)
         
         job = Job(
             id=str(job_row['id']),
@@ -304,4 +314,11 @@ async def test_resume_tailoring():
 
 
 if __name__ == "__main__":
+    # uvloop is optional (not available on Windows); fall back to the default loop
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
     asyncio.run(test_resume_tailoring())
\ No newline at end of file
@@ -1,19 +1,74 @@
 # services/database.py
+import asyncio
 import asyncpg
 import logging
-from typing import Optional
-from contextlib import asynccontextmanager
+import orjson
+from typing import Any, List, Optional
 from config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# JSONB binary wire format: a version byte followed by the JSON text
+_JSONB_VERSION = b'\x01'
+
+
+def _encode_jsonb(value: Any) -> bytes:
+    """Encode a JSONB parameter; pre-serialized strings are sent as-is"""
+    if isinstance(value, str):
+        return _JSONB_VERSION + value.encode()
+    return _JSONB_VERSION + orjson.dumps(value)
+
+
+def _decode_jsonb(data: bytes) -> Any:
+    """Decode a JSONB column straight to Python objects"""
+    return orjson.loads(data[1:])
+
+
+def _encode_json(value: Any) -> str:
+    """Encode a JSON parameter; pre-serialized strings are sent as-is"""
+    if isinstance(value, str):
+        return value
+    return orjson.dumps(value).decode()
+
+
+async def init_connection(conn: asyncpg.Connection):
+    """Per-connection setup: encode/decode JSONB and JSON with orjson"""
+    await conn.set_type_codec(
+        'jsonb',
+        encoder=_encode_jsonb,
+        decoder=_decode_jsonb,
+        schema='pg_catalog',
+        format='binary'
+    )
+    await conn.set_type_codec(
+        'json',
+        encoder=_encode_json,
+        decoder=orjson.loads,
+        schema='pg_catalog',
+        format='text'
+    )
+
 
 class Database:
+    """PostgreSQL connection pool wrapper"""
+
     def __init__(self):
         self.pool: Optional[asyncpg.Pool] = None
+        self._connect_lock = asyncio.Lock()
 
     async def connect(self):
-        """Create database connection pool"""
+        """Create database connection pool (reused if already open)"""
+        if self.pool is not None:
+            return
+
+        # Concurrent callers wait for the first one instead of each opening a pool
+        async with self._connect_lock:
+            if self.pool is not None:
+                return
+            await self._create_pool()
+
+    async def _create_pool(self):
+        """Open the asyncpg pool from settings"""
         try:
             # Use individual settings instead of DATABASE_URL
             connect_kwargs = {
@@ -21,18 +76,26 @@ class Database:
                 'port': settings.DB_PORT,
                 'user': settings.DB_USER,
                 'database': settings.DB_NAME,
-                'min_size': 2,
-                'max_size': 10
+                'min_size': settings.DB_POOL_MIN_SIZE,
+                'max_size': settings.DB_POOL_MAX_SIZE,
+                # Recycle connections periodically and drop idle ones
+                'max_queries': 50_000,
+                'max_inactive_connection_lifetime': 300,
+                'command_timeout': 60,
+                # Hot-path queries (e.g. dedup lookups) are prepared once per
+                # connection and reused from asyncpg's statement cache
+                'statement_cache_size': 1024,
+                'init': init_connection
             }
-            
+
             # Only add password if it exists
             if settings.DB_PASSWORD:
                 connect_kwargs['password'] = settings.DB_PASSWORD
-            
+
             logger.info(f"Connecting to database: {settings.DB_NAME} as user: {settings.DB_USER}")
             self.pool = await asyncpg.create_pool(**connect_kwargs)
             logger.info("Database pool created successfully")
-            
+
         except Exception as e:
             logger.error(f"Failed to create database pool: {e}")
             raise
@@ -41,39 +104,38 @@ class Database:
         """Close database connection pool"""
         if self.pool:
             await self.pool.close()
+            self.pool = None
             logger.info("Database pool closed")
 
-    @asynccontextmanager
-    async def acquire(self):
-        """Acquire a connection from the pool (context manager)"""
-        async with self.pool.acquire() as conn:
-            yield conn
+    def acquire(self):
+        """Acquire a connection from the pool (use as `async with db.acquire() as conn`)"""
+        return self.pool.acquire()
 
-    async def fetch(self, query: str, *args):
+    async def fetch(self, query: str, *args) -> List[asyncpg.Record]:
         """Fetch multiple rows"""
         async with self.pool.acquire() as conn:
             return await conn.fetch(query, *args)
 
-    async def fetchrow(self, query: str, *args):
+    async def fetchrow(self, query: str, *args) -> Optional[asyncpg.Record]:
         """Fetch single row"""
         async with self.pool.acquire() as conn:
             return await conn.fetchrow(query, *args)
 
-    async def fetchval(self, query: str, *args):
+    async def fetchval(self, query: str, *args) -> Any:
         """Fetch single value"""
         async with self.pool.acquire() as conn:
             return await conn.fetchval(query, *args)
 
-    async def execute(self, query: str, *args):
+    async def execute(self, query: str, *args) -> str:
         """Execute query without return"""
         async with self.pool.acquire() as conn:
             return await conn.execute(query, *args)
 
-    async def executemany(self, query: str, args_list):
+    async def executemany(self, query: str, args_list: List[tuple]) -> None:
         """Execute query multiple times"""
         async with self.pool.acquire() as conn:
             await conn.executemany(query, args_list)
 
 
 # Global database instance
-db = Database()
\ No newline at end of file
+db = Database()
@@ -1,12 +1,89 @@
 # services/deduplicator.py
-import hashlib
-import json  # ADD THIS IMPORT
+from collections import defaultdict
+from datetime import datetime
 from difflib import SequenceMatcher
-from typing import Optional
+from typing import List, Optional, Tuple
 import logging
 
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:  # fall back to difflib
+    fuzz = process = None
+
 logger = logging.getLogger(__name__)
 
+# Dedup queries are module constants so every call sends identical text and
+# reuses the connection's cached prepared statement.
+
+# First exact hit as (id, match_type); URL wins over content hash
+EXACT_DUPLICATE_SQL = """
+    SELECT id, match_type FROM (
+        (SELECT id, 'url' as match_type, 1 as priority
+         FROM raw_jobs
+         WHERE platform = $1 AND url = $2
+         LIMIT 1)
+        UNION ALL
+        (SELECT id, 'hash' as match_type, 2 as priority
+         FROM raw_jobs
+         WHERE content_hash = $3
+         LIMIT 1)
+    ) matches
+    ORDER BY priority
+    LIMIT 1
+"""
+
+# Same check for a whole batch, as one boolean per input position. EXISTS
+# can be answered from the unique (platform, url) / content_hash indexes
+# without fetching the matching row's id.
+EXISTS_DUPLICATE_BATCH_SQL = """
+    SELECT
+        EXISTS(SELECT 1 FROM raw_jobs r
+               WHERE r.platform = t.platform AND r.url = t.url)
+        OR EXISTS(SELECT 1 FROM raw_jobs r
+                  WHERE r.content_hash = t.content_hash) AS is_duplicate
+    FROM unnest($1::text[], $2::text[], $3::text[])
+        WITH ORDINALITY AS t(platform, url, content_hash, idx)
+    ORDER BY t.idx
+"""
+
+# Jobs scraped since $1 plus the prior 7 days of postings from the same
+# platform/company, oldest first, for bulk fuzzy dedup
+SOFT_DUPLICATE_CANDIDATES_SQL = """
+    SELECT id, platform, company_norm, title_norm, scraped_at >= $1 AS is_new
+    FROM raw_jobs
+    WHERE scraped_at > $1 - INTERVAL '7 days'
+      AND title_norm IS NOT NULL
+      AND title_norm <> ''
+      AND (platform, company_norm) IN (
+          SELECT DISTINCT platform, company_norm
+          FROM raw_jobs
+          WHERE scraped_at >= $1 AND company_norm IS NOT NULL
+      )
+    ORDER BY scraped_at
+"""
+
+# Recent same-company postings with a similar title, most similar first
+FUZZY_CANDIDATES_SQL = """
+    SELECT id, title_norm as title
+    FROM raw_jobs
+    WHERE platform = $1
+      AND company_norm = $2
+      AND scraped_at > NOW() - INTERVAL '7 days'
+      AND title_norm % $3
+    ORDER BY similarity(title_norm, $3) DESC
+    LIMIT 50
+"""
+
+def scrape_watermark() -> datetime:
+    """
+    Current time on the raw_jobs.scraped_at clock: naive UTC, as written
+    from RawJob.scraped_at. Take it before a search and pass it to
+    find_soft_duplicates_bulk() afterwards. (LOCALTIMESTAMP / NOW() would
+    follow the database session's timezone instead.)
+    """
+    return datetime.utcnow()
+
+
 class JobDeduplicator:
     """Detect duplicate jobs using multiple strategies."""
     
@@ -18,66 +95,134 @@ class JobDeduplicator:
         Check if job is duplicate.
         Returns: (is_duplicate, existing_job_id)
         """
-        # Strategy 1: Exact URL match
-        existing = await self._check_url_duplicate(
-            raw_job.platform, 
-            str(raw_job.url)
-        )
-        if existing:
-            logger.info(f"Duplicate found by URL: {raw_job.url}")
-            return True, existing
-        
-        # Strategy 2: Content hash match
-        existing = await self._check_content_hash_duplicate(
-            raw_job.content_hash
-        )
-        if existing:
-            logger.info(f"Duplicate found by content hash: {raw_job.url}")
-            return True, existing
-        
-        # Strategy 3: Fuzzy matching (DISABLED FOR NOW)
-        # existing = await self._check_fuzzy_duplicate(raw_job)
-        # if existing:
-        #     logger.info(f"Duplicate found by fuzzy match: {raw_job.url}")
-        #     return True, existing
+        async with self.db.acquire() as conn:
+            # Strategies 1-2: Exact URL match, then content hash match
+            existing = await self._check_exact_duplicate(
+                conn,
+                raw_job.platform,
+                str(raw_job.url),
+                raw_job.content_hash
+            )
+            if existing:
+                match_type = 'URL' if existing['match_type'] == 'url' else 'content hash'
+                logger.info(f"Duplicate found by {match_type}: {raw_job.url}")
+                return True, existing['id']
+            
+            # Strategy 3: Fuzzy matching is kept off the ingest path; a
+            # periodic worker runs find_soft_duplicates_bulk() instead
         
         return False, None
     
-    async def _check_url_duplicate(
-        self, 
-        platform: str, 
-        url: str
-    ) -> Optional[str]:
-        """Check for exact URL match."""
+    async def is_duplicate_batch(
+        self,
+        raw_jobs: List['RawJob']
+    ) -> List[bool]:
+        """
+        Check a batch of jobs with one query.
+        Returns one is_duplicate flag per job, in order; use is_duplicate()
+        when the existing job's id is needed.
+        
+        A job repeating the URL or content hash of an earlier job in the same
+        batch is also a duplicate.
+        """
+        if not raw_jobs:
+            return []
+        
+        urls = [str(raw_job.url) for raw_job in raw_jobs]
+        
         async with self.db.acquire() as conn:
-            result = await conn.fetchrow(
-                """
-                SELECT id FROM raw_jobs 
-                WHERE platform = $1 AND url = $2
-                LIMIT 1
-                """,
-                platform, url
+            rows = await conn.fetch(
+                EXISTS_DUPLICATE_BATCH_SQL,
+                [raw_job.platform for raw_job in raw_jobs],
+                urls,
+                [raw_job.content_hash for raw_job in raw_jobs]
             )
-            return result['id'] if result else None
+        
+        results = []
+        seen_urls = set()
+        seen_hashes = set()
+        for raw_job, url, row in zip(raw_jobs, urls, rows):
+            url_key = (raw_job.platform, url)
+            
+            if row['is_duplicate']:
+                logger.info(f"Duplicate found by URL or content hash: {raw_job.url}")
+                results.append(True)
+            elif url_key in seen_urls or raw_job.content_hash in seen_hashes:
+                logger.info(f"Duplicate found within batch: {raw_job.url}")
+                results.append(True)
+            else:
+                results.append(False)
+            
+            seen_urls.add(url_key)
+            seen_hashes.add(raw_job.content_hash)
+        
+        return results
     
-    async def _check_content_hash_duplicate(
-        self, 
-        content_hash: str
-    ) -> Optional[str]:
-        """Check for content hash match."""
+    async def find_soft_duplicates_bulk(
+        self,
+        since: datetime,
+        similarity_threshold: float = 0.90
+    ) -> List[Tuple[str, str]]:
+        """
+        Fuzzy-match every job scraped since `since` against earlier postings
+        from the same platform and company (last 7 days).
+        Meant for a periodic worker rather than the ingest path.
+        Returns: [(duplicate_job_id, original_job_id), ...]
+        """
         async with self.db.acquire() as conn:
-            result = await conn.fetchrow(
-                """
-                SELECT id FROM raw_jobs 
-                WHERE content_hash = $1
-                LIMIT 1
-                """,
-                content_hash
-            )
-            return result['id'] if result else None
+            rows = await conn.fetch(SOFT_DUPLICATE_CANDIDATES_SQL, since)
+        
+        groups = defaultdict(list)
+        for row in rows:
+            groups[(row['platform'], row['company_norm'])].append(row)
+        
+        duplicates = []
+        for group in groups.values():
+            titles = [row['title_norm'] for row in group]
+            new_positions = [i for i, row in enumerate(group) if row['is_new']]
+            
+            if process is not None:
+                # One C call per company: new titles x every title in the group
+                scores = process.cdist(
+                    [titles[i] for i in new_positions],
+                    titles,
+                    scorer=fuzz.ratio,
+                    score_cutoff=similarity_threshold * 100
+                )
+                for k, i in enumerate(new_positions):
+                    earlier = scores[k, :i]  # only postings scraped before it
+                    if earlier.size and earlier.max() > 0:
+                        duplicates.append((group[i]['id'], group[int(earlier.argmax())]['id']))
+                continue
+            
+            for i in new_positions:
+                candidates = [(row['id'], row['title_norm']) for row in group[:i]]
+                original = self._best_fuzzy_match(titles[i], candidates, similarity_threshold)
+                if original:
+                    duplicates.append((group[i]['id'], original))
+        
+        logger.info(f"Found {len(duplicates)} fuzzy duplicates since {since}")
+        return duplicates
+    
+    async def _check_exact_duplicate(
+        self,
+        conn,
+        platform: str,
+        url: str,
+        content_hash: str
+    ):
+        """
+        Check for exact URL match or content hash match in one round-trip.
+        Returns the first hit as a record with `id` and `match_type`
+        ('url' wins over 'hash'), or None.
+        """
+        return await conn.fetchrow(
+            EXACT_DUPLICATE_SQL, platform, url, content_hash
+        )
     
     async def _check_fuzzy_duplicate(
         self, 
+        conn,
         raw_job: 'RawJob',
         similarity_threshold: float = 0.90
     ) -> Optional[str]:
@@ -85,50 +230,65 @@ class JobDeduplicator:
         Check for fuzzy duplicates among recent jobs.
         Only compare against jobs from last 7 days to limit overhead.
         """
-        title = raw_job.raw_data.get('title', '').lower()
-        company = raw_job.raw_data.get('company', '').lower()
+        title = raw_job.title_lower
+        company = raw_job.company_lower
         
         if not title or not company:
             return None
         
-        async with self.db.acquire() as conn:
-            # Use PostgreSQL JSON operators to extract fields
-            recent_jobs = await conn.fetch(
-                """
-                SELECT 
-                    id, 
-                    raw_data->>'title' as title,
-                    raw_data->>'company' as company
-                FROM raw_jobs
-                WHERE platform = $1
-                  AND raw_data->>'company' ILIKE $2
-                  AND scraped_at > NOW() - INTERVAL '7 days'
-                LIMIT 50
-                """,
-                raw_job.platform,
-                f"%{company}%"
+        # title_norm / company_norm are indexed generated columns
+        # (lower(raw_data->>...)); the trigram index prunes candidates
+        recent_jobs = await conn.fetch(
+            FUZZY_CANDIDATES_SQL,
+            raw_job.platform,
+            company,
+            title
+        )
+        
+        candidates = [(job['id'], job['title']) for job in recent_jobs]
+        if not candidates:
+            return None
+        
+        return self._best_fuzzy_match(title, candidates, similarity_threshold)
+    
+    def _best_fuzzy_match(
+        self,
+        title: str,
+        candidates: List[Tuple[str, str]],
+        similarity_threshold: float
+    ) -> Optional[str]:
+        """Return the id of the (id, title) candidate matching title, if any."""
+        if process is not None:
+            # Score every candidate title in one C call and keep the best
+            match = process.extractOne(
+                title,
+                [existing_title for _, existing_title in candidates],
+                scorer=fuzz.ratio,
+                score_cutoff=similarity_threshold * 100
             )
+            if match:
+                existing_title, score, idx = match
+                logger.debug(
+                    f"Fuzzy match: {score / 100:.2f} - "
+                    f"'{title}' vs '{existing_title}'"
+                )
+                return candidates[idx][0]
+            return None
+        
+        for job_id, existing_title in candidates:
+            matcher = SequenceMatcher(None, title, existing_title)
+            
+            # Cheap upper bounds on ratio() reject most titles early
+            if (matcher.real_quick_ratio() < similarity_threshold
+                    or matcher.quick_ratio() < similarity_threshold):
+                continue
             
-            for job in recent_jobs:
-                # Now job['title'] and job['company'] are already strings
-                existing_title = (job['title'] or '').lower()
-                existing_company = (job['company'] or '').lower()
-                
-                # Skip if no title
-                if not existing_title:
-                    continue
-                
-                similarity = SequenceMatcher(
-                    None, 
-                    title, 
-                    existing_title
-                ).ratio()
-                
-                if similarity >= similarity_threshold:
-                    logger.debug(
-                        f"Fuzzy match: {similarity:.2f} - "
-                        f"'{title}' vs '{existing_title}'"
-                    )
-                    return job['id']
-        
-        return None
\ No newline at end of file
+            similarity = matcher.ratio()
+            if similarity >= similarity_threshold:
+                logger.debug(
+                    f"Fuzzy match: {similarity:.2f} - "
+                    f"'{title}' vs '{existing_title}'"
+                )
+                return job_id
+        
+        return None
@@ -1,29 +1,174 @@
 # services/embeddings.py
 from sentence_transformers import SentenceTransformer
-from typing import List, Dict, Union
+from collections import OrderedDict
+import asyncio
+import atexit
+import os
+import threading
+import warnings
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple, Union
+import hashlib
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity as sklearn_cosine_similarity
 import logging
+import sqlite3
+import torch
+
+try:
+    import simsimd  # optional SIMD cosine kernels
+except ImportError:
+    simsimd = None
+
+try:
+    import numba  # optional JIT kernel for the per-pair dot product
+except ImportError:
+    numba = None
 
 logger = logging.getLogger(__name__)
 
+# Rows of a float16 candidate matrix upcast per step in find_best_matches
+# (4096 x 384 float32 = 6MB, roughly L2-sized)
+UPCAST_BLOCK_ROWS = 4096
+
+# Intra-op threads for CPU inference; more than ~8 only adds contention
+TORCH_NUM_THREADS = min(8, os.cpu_count() or 1)
+_torch_configured = False
+
+# Below this many texts encode_bulk() just uses the in-process encode()
+BULK_MIN_TEXTS = 1000
+
+
+def _configure_torch():
+    """Set torch CPU thread pools once per process"""
+    global _torch_configured
+    if _torch_configured:
+        return
+    _torch_configured = True
+    
+    torch.set_num_threads(TORCH_NUM_THREADS)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # Can only be set before any inter-op parallel work has started
+        logger.debug("torch inter-op thread count already fixed")
+
+
+if numba is not None:
+    @numba.njit(cache=True, fastmath=True)
+    def _dot_unit(a, b):
+        """Dot product of two unit vectors (= their cosine similarity)"""
+        s = 0.0
+        for i in range(a.shape[0]):
+            s += a[i] * b[i]
+        return s
+else:
+    _dot_unit = None
+
+
+def _join_list(value) -> str:
+    """Comma-join list fields; other values are stringified"""
+    return ', '.join(value) if isinstance(value, list) else str(value)
+
+
+# (label, key, formatter) for embed_job_description, most important first;
+# fields that are missing or empty are skipped
+_JOB_TEXT_FIELDS = (
+    ("Job Title: ", 'title', str),
+    ("Description: ", 'description', lambda desc: desc[:500]),  # first 500 chars
+    ("Required Skills: ", 'skills', _join_list),
+    ("Company: ", 'company', str),
+    ("Location: ", 'location', str),
+)
+
+# Same for embed_user_profile
+_PROFILE_TEXT_FIELDS = (
+    ("Skills: ", 'skills', _join_list),
+    ("Experience Level: ", 'experience_level', str),
+    ("Years of Experience: ", 'years_of_experience', str),
+    ("Interested in: ", 'preferred_industries', _join_list),
+)
+
+
+def _unit_rows(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize along the last axis; zero vectors stay zero."""
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
 class EmbeddingService:
     """Generate and compare text embeddings for semantic matching."""
     
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+    def __init__(
+        self,
+        model_name: str = "all-MiniLM-L6-v2",
+        cache_path: Optional[Path] = None,
+        backend: str = "torch",
+        onnx_file_name: Optional[str] = None,
+        device: Optional[str] = None
+    ):
         """
         Initialize embedding model.
         
         Args:
             model_name: HuggingFace model name. Default is fast and accurate.
+            cache_path: Optional sqlite file that persists encode() results
+                across runs (in addition to the in-memory LRU cache)
+            backend: "torch" (default) or "onnx" to run the model with ONNX
+                Runtime on CPU (requires optimum[onnxruntime])
+            onnx_file_name: ONNX file in the model repo to load, e.g. the
+                int8 "onnx/model_qint8_avx512_vnni.onnx"; default is fp32
+            device: Torch device, e.g. "cuda:0"; default is CUDA when
+                available, else CPU
         """
         self.model_name = model_name
-        logger.info(f"Loading embedding model: {model_name}")
-        self.model = SentenceTransformer(model_name)
+        _configure_torch()
+        if device is None:
+            device = "cuda" if backend == "torch" and torch.cuda.is_available() else "cpu"
+        logger.info(f"Loading embedding model: {model_name} ({backend} backend, {device})")
+        
+        model_kwargs = {}
+        if backend == "onnx":
+            model_kwargs["provider"] = "CPUExecutionProvider"
+            if onnx_file_name:
+                model_kwargs["file_name"] = onnx_file_name
+        self.model = SentenceTransformer(
+            model_name, device=device, backend=backend, model_kwargs=model_kwargs or None
+        )
+        self.model.eval()
+        
+        # Pay one-time costs (CUDA context, cuBLAS handles, lazy init) here
+        # instead of on the first real request
+        with torch.inference_mode():
+            self.model.encode(["warmup"] * 4, batch_size=4, show_progress_bar=False)
         self.embedding_dim = self.model.get_sentence_embedding_dimension()
         logger.info(f"Model loaded. Embedding dimension: {self.embedding_dim}")
+        
+        # encode() results keyed by hash of (model, normalize, text); the
+        # ONNX/quantized variants produce slightly different vectors
+        self._cache_namespace = (
+            model_name if backend == "torch"
+            else f"{model_name}:{backend}:{onnx_file_name or ''}"
+        )
+        self.cache_size = 4096
+        self._cache: OrderedDict = OrderedDict()
+        self._cache_lock = threading.Lock()  # encode() may also run in worker threads
+        self._disk_cache: Optional[sqlite3.Connection] = None
+        if cache_path is not None:
+            self._disk_cache = sqlite3.connect(str(cache_path), check_same_thread=False)
+            self._disk_cache.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key BLOB PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+        
+        # Created on first encode_async() / encode_bulk() call
+        self._batcher: Optional['AsyncEmbeddingBatcher'] = None
+        self._pool: Optional[Dict] = None
     
-    def encode(self, texts: Union[str, List[str]], normalize: bool = True) -> np.ndarray:
+    def encode(
+        self,
+        texts: Union[str, List[str]],
+        normalize: bool = True,
+        dtype: np.dtype = np.float32
+    ) -> np.ndarray:
         """
         Generate embeddings for text(s) - returns numpy arrays.
         Compatible with scoring_engine.py expectations.
@@ -31,6 +176,9 @@ class EmbeddingService:
         Args:
             texts: Single text string or list of texts
             normalize: If True, normalize embeddings to unit length
+            dtype: Output dtype. np.float16 halves the memory (and bandwidth)
+                of stored candidate matrices; for normalized MiniLM vectors the
+                cosine error is below 1e-3
             
         Returns:
             numpy array of embeddings
@@ -43,16 +191,136 @@ class EmbeddingService:
         
         # Filter out empty texts
         valid_texts = [t if t and t.strip() else "" for t in texts]
-        embeddings = self.model.encode(
-            valid_texts, 
+        keys = [self._cache_key(t, normalize) for t in valid_texts]
+        
+        # Run the model only on texts not seen before
+        with self._cache_lock:
+            vectors = {key: vec for key in set(keys) if (vec := self._cache_get(key)) is not None}
+        misses = {key: text for key, text in zip(keys, valid_texts) if key not in vectors}
+        
+        if misses:
+            with torch.inference_mode():
+                embeddings = self.model.encode(
+                    list(misses.values()), 
+                    convert_to_numpy=True,
+                    normalize_embeddings=normalize,
+                    show_progress_bar=False
+                )
+            with self._cache_lock:
+                for key, vec in zip(misses, embeddings):
+                    vectors[key] = vec
+                    self._cache_put(key, vec)
+                if self._disk_cache is not None:
+                    self._disk_cache.commit()
+        
+        return np.stack([vectors[key] for key in keys]).astype(dtype, copy=False)
+    
+    async def encode_async(self, text: str) -> np.ndarray:
+        """
+        Embed a single text (normalized), batched with concurrent callers.
+        
+        Requests arriving within a few milliseconds of each other share one
+        model call, which runs off the event loop.
+        """
+        if self._batcher is None:
+            self._batcher = AsyncEmbeddingBatcher(self)
+        return await self._batcher.encode(text)
+    
+    def encode_bulk(
+        self,
+        texts: List[str],
+        workers: Optional[int] = None,
+        normalize: bool = True
+    ) -> np.ndarray:
+        """
+        Embed a large corpus (e.g. re-indexing all jobs) on a pool of worker
+        processes - one per GPU, or `workers` CPU processes.
+        
+        Bypasses the encode() cache; small inputs fall back to encode().
+        
+        Args:
+            texts: List of texts
+            workers: Number of CPU worker processes (ignored on GPU)
+            normalize: If True, normalize embeddings to unit length
+            
+        Returns:
+            numpy array of embeddings
+        """
+        if len(texts) < BULK_MIN_TEXTS:
+            return self.encode(texts, normalize=normalize)
+        
+        if self._pool is None:
+            if self.model.device.type == "cuda":
+                devices = [f"cuda:{i}" for i in range(torch.cuda.device_count())]
+            else:
+                devices = ["cpu"] * (workers or min(4, os.cpu_count() or 1))
+            logger.info(f"Starting embedding worker pool on {devices}")
+            self._pool = self.model.start_multi_process_pool(target_devices=devices)
+            atexit.register(self.close_pool)
+        
+        valid_texts = [t if t and t.strip() else "" for t in texts]
+        return self.model.encode(
+            valid_texts,
+            pool=self._pool,
+            batch_size=64,
+            chunk_size=5000,
             convert_to_numpy=True,
             normalize_embeddings=normalize,
             show_progress_bar=False
         )
-        
-        return embeddings
     
-    def cosine_similarity(self, embedding1: np.ndarray, embedding2: np.ndarray) -> float:
+    def close_pool(self):
+        """Stop the encode_bulk() worker processes, if started"""
+        if self._pool is not None:
+            self.model.stop_multi_process_pool(self._pool)
+            self._pool = None
+    
+    def _cache_key(self, text: str, normalize: bool) -> bytes:
+        """Content hash of an encode() input; includes the model so swaps don't collide"""
+        payload = f"{self._cache_namespace}\0{int(normalize)}\0{text}".encode()
+        return hashlib.blake2b(payload, digest_size=16).digest()
+    
+    def _cache_get(self, key: bytes) -> Optional[np.ndarray]:
+        """Look up a cached embedding in memory, then on disk"""
+        vec = self._cache.get(key)
+        if vec is not None:
+            self._cache.move_to_end(key)
+            return vec
+        
+        if self._disk_cache is not None:
+            row = self._disk_cache.execute(
+                "SELECT vector FROM embeddings WHERE key = ?", (key,)
+            ).fetchone()
+            if row:
+                vec = np.frombuffer(row[0], dtype=np.float32)
+                self._remember(key, vec)
+                return vec
+        
+        return None
+    
+    def _cache_put(self, key: bytes, vec: np.ndarray):
+        """Cache a fresh embedding in memory and (if enabled) on disk"""
+        vec = np.array(vec, dtype=np.float32)  # own copy, not a view of the batch
+        self._remember(key, vec)
+        if self._disk_cache is not None:
+            self._disk_cache.execute(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                (key, vec.tobytes())
+            )
+    
+    def _remember(self, key: bytes, vec: np.ndarray):
+        """Insert into the in-memory LRU, evicting the oldest entry if full"""
+        self._cache[key] = vec
+        self._cache.move_to_end(key)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+    
+    def cosine_similarity(
+        self,
+        embedding1: np.ndarray,
+        embedding2: np.ndarray,
+        normalized: bool = False
+    ) -> float:
         """
         Compute cosine similarity between two embeddings (numpy arrays).
         Compatible with scoring_engine.py expectations.
@@ -60,20 +328,31 @@ class EmbeddingService:
         Args:
             embedding1: First embedding vector (numpy array)
             embedding2: Second embedding vector (numpy array)
+            normalized: True if both vectors are already unit length (e.g. from
+                encode(normalize=True)); skips the norm computation
             
         Returns:
             Similarity score between -1 and 1 (typically 0 to 1 for normalized embeddings)
         """
-        # Handle 1D arrays
-        if len(embedding1.shape) == 1:
-            embedding1 = embedding1.reshape(1, -1)
-        if len(embedding2.shape) == 1:
-            embedding2 = embedding2.reshape(1, -1)
-        
-        # Compute cosine similarity
-        similarity = sklearn_cosine_similarity(embedding1, embedding2)[0][0]
-        
-        return float(similarity)
+        a = embedding1.ravel()
+        b = embedding2.ravel()
+        
+        if normalized:
+            if _dot_unit is not None:
+                return float(_dot_unit(a, b))
+            return float(np.dot(a, b))
+        
+        if simsimd is not None:
+            # simsimd scores zero vectors as identical; cosine is 0 for them
+            if not (a.any() and b.any()):
+                return 0.0
+            # simsimd returns cosine distance
+            return 1.0 - float(simsimd.cosine(
+                a.astype(np.float32, copy=False), b.astype(np.float32, copy=False)
+            ))
+        
+        norms = float(np.linalg.norm(a) * np.linalg.norm(b))
+        return float(np.dot(a, b)) / norms if norms else 0.0
     
     # Legacy methods (for backward compatibility)
     def generate_embedding(self, text: str) -> List[float]:
@@ -89,7 +368,8 @@ class EmbeddingService:
         if not text or not text.strip():
             return [0.0] * self.embedding_dim
         
-        embedding = self.model.encode(text, convert_to_numpy=True)
+        with torch.inference_mode():
+            embedding = self.model.encode(text, convert_to_numpy=True)
         return embedding.tolist()
     
     def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
@@ -107,30 +387,40 @@ class EmbeddingService:
         
         # Filter out empty texts
         valid_texts = [t if t and t.strip() else "" for t in texts]
-        embeddings = self.model.encode(valid_texts, convert_to_numpy=True)
+        with torch.inference_mode():
+            embeddings = self.model.encode(valid_texts, convert_to_numpy=True)
         return embeddings.tolist()
     
     def compute_similarity(
         self, 
-        embedding1: List[float], 
-        embedding2: List[float]
+        embedding1: Union[List[float], np.ndarray], 
+        embedding2: Union[List[float], np.ndarray]
     ) -> float:
         """
         Compute cosine similarity between two embeddings (legacy method).
         
+        Pass the numpy arrays returned by encode(); list inputs still work
+        but are converted on every call and are deprecated.
+        
         Args:
-            embedding1: First embedding vector (list)
-            embedding2: Second embedding vector (list)
+            embedding1: First embedding vector
+            embedding2: Second embedding vector
             
         Returns:
             Similarity score between 0 and 1
         """
-        # Convert to numpy arrays
-        emb1 = np.array(embedding1).reshape(1, -1)
-        emb2 = np.array(embedding2).reshape(1, -1)
+        if not (isinstance(embedding1, np.ndarray) and isinstance(embedding2, np.ndarray)):
+            warnings.warn(
+                "compute_similarity() with list embeddings is deprecated; "
+                "pass the numpy arrays returned by encode()",
+                DeprecationWarning,
+                stacklevel=2
+            )
+            embedding1 = np.asarray(embedding1, dtype=np.float32)
+            embedding2 = np.asarray(embedding2, dtype=np.float32)
         
         # Compute cosine similarity
-        similarity = sklearn_cosine_similarity(emb1, emb2)[0][0]
+        similarity = self.cosine_similarity(embedding1, embedding2)
         
         # Clamp to [0, 1] range
         return max(0.0, min(1.0, similarity))
@@ -146,7 +436,8 @@ class EmbeddingService:
         
         Args:
             query_embedding: Query embedding vector
-            candidate_embeddings: List of candidate embedding vectors
+            candidate_embeddings: List of candidate embedding vectors; a
+                float16 matrix (see encode(dtype=...)) is read in half precision
             top_k: Number of top matches to return
             
         Returns:
@@ -155,22 +446,36 @@ class EmbeddingService:
         if not len(candidate_embeddings):
             return []
         
-        # Convert to numpy if needed
-        if isinstance(query_embedding, list):
-            query = np.array(query_embedding).reshape(1, -1)
-        else:
-            query = query_embedding.reshape(1, -1)
-        
-        if isinstance(candidate_embeddings, list):
-            candidates = np.array(candidate_embeddings)
+        query = np.asarray(query_embedding, dtype=np.float32).ravel()
+        
+        if getattr(candidate_embeddings, 'dtype', None) == np.float16:
+            # Keep the matrix in half precision and upcast it block by block
+            unit_query = _unit_rows(query)
+            similarities = np.empty(len(candidate_embeddings), dtype=np.float32)
+            for start in range(0, len(candidate_embeddings), UPCAST_BLOCK_ROWS):
+                block = candidate_embeddings[start:start + UPCAST_BLOCK_ROWS].astype(np.float32)
+                similarities[start:start + len(block)] = _unit_rows(block) @ unit_query
+        elif simsimd is not None:
+            # Contiguous float32 arrays, similarities in one call
+            candidates = np.ascontiguousarray(candidate_embeddings, dtype=np.float32)
+            similarities = 1.0 - np.asarray(
+                simsimd.cdist(query[np.newaxis, :], candidates, metric="cosine")
+            )[0]
+            # simsimd scores zero vectors as identical; cosine is 0 for them
+            if not query.any():
+                similarities[:] = 0.0
+            else:
+                similarities[~candidates.any(axis=1)] = 0.0
         else:
-            candidates = candidate_embeddings
-        
-        # Compute similarities
-        similarities = sklearn_cosine_similarity(query, candidates)[0]
+            candidates = np.ascontiguousarray(candidate_embeddings, dtype=np.float32)
+            similarities = _unit_rows(candidates) @ _unit_rows(query)
         
-        # Get top K indices
-        top_indices = np.argsort(similarities)[::-1][:top_k]
+        # Get top K indices: O(N) selection, then sort only the K survivors
+        k = min(top_k, similarities.shape[0])
+        if k <= 0:
+            return []
+        top = np.argpartition(-similarities, k - 1)[:k]
+        top_indices = top[np.argsort(-similarities[top], kind='stable')]
         
         results = [
             {
@@ -192,35 +497,11 @@ class EmbeddingService:
         Returns:
             Combined text string
         """
-        parts = []
-        
-        # Title (most important)
-        if job_data.get('title'):
-            parts.append(f"Job Title: {job_data['title']}")
-        
-        # Description
-        if job_data.get('description'):
-            # Take first 500 chars of description
-            desc = job_data['description'][:500]
-            parts.append(f"Description: {desc}")
-        
-        # Skills
-        if job_data.get('skills'):
-            skills = job_data['skills']
-            if isinstance(skills, list):
-                skills_text = ', '.join(skills)
-            else:
-                skills_text = str(skills)
-            parts.append(f"Required Skills: {skills_text}")
-        
-        # Company and location
-        if job_data.get('company'):
-            parts.append(f"Company: {job_data['company']}")
-        
-        if job_data.get('location'):
-            parts.append(f"Location: {job_data['location']}")
-        
-        return ' | '.join(parts)
+        return ' | '.join(
+            f"{label}{format_value(value)}"
+            for label, key, format_value in _JOB_TEXT_FIELDS
+            if (value := job_data.get(key))
+        )
     
     def embed_user_profile(self, profile_data: Dict) -> str:
         """
@@ -232,32 +513,222 @@ class EmbeddingService:
         Returns:
             Combined text string
         """
-        parts = []
+        return ' | '.join(
+            f"{label}{format_value(value)}"
+            for label, key, format_value in _PROFILE_TEXT_FIELDS
+            if (value := profile_data.get(key))
+        )
+
+
+class AsyncEmbeddingBatcher:
+    """
+    Collect single-text encode requests from concurrent coroutines and
+    run them through EmbeddingService.encode in batches.
+    
+    A batch is flushed once it holds max_batch_size texts or max_wait_ms
+    has passed since its first text arrived.
+    """
+    
+    def __init__(
+        self,
+        service: EmbeddingService,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 20
+    ):
+        self.service = service
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+    
+    async def encode(self, text: str) -> np.ndarray:
+        """Queue a text and wait for its embedding"""
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+        
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        return await future
+    
+    async def _run(self):
+        """Worker: drain the queue in batches until cancelled"""
+        loop = asyncio.get_running_loop()
         
-        # Skills (most important)
-        if profile_data.get('skills'):
-            skills = profile_data['skills']
-            if isinstance(skills, list):
-                skills_text = ', '.join(skills)
-            else:
-                skills_text = str(skills)
-            parts.append(f"Skills: {skills_text}")
-        
-        # Experience level
-        if profile_data.get('experience_level'):
-            parts.append(f"Experience Level: {profile_data['experience_level']}")
-        
-        # Years of experience
-        if profile_data.get('years_of_experience'):
-            parts.append(f"Years of Experience: {profile_data['years_of_experience']}")
-        
-        # Preferred industries
-        if profile_data.get('preferred_industries'):
-            industries = profile_data['preferred_industries']
-            if isinstance(industries, list):
-                industries_text = ', '.join(industries)
-            else:
-                industries_text = str(industries)
-            parts.append(f"Interested in: {industries_text}")
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            texts = [text for text, _ in batch]
+            try:
+                embeddings = await asyncio.to_thread(self.service.encode, texts)
+            except Exception as e:
+                logger.error(f"Batched encode of {len(texts)} texts failed: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            for (_, future), embedding in zip(batch, embeddings):
+                if not future.done():
+                    future.set_result(embedding)
+
+
+class JobEmbeddingStore:
+    """
+    Index of job embeddings for repeated matching.
+    
+    Vectors are kept L2-normalized in one contiguous matrix (one row per
+    job, row order matching `ids`), so a query is a single matrix-vector
+    product instead of re-encoding job texts each time.
+    
+    By default the matrix is float32 in RAM. With `path`, it is a float16
+    np.memmap on disk instead and only the `hot_rows` most recently used
+    vectors are held in RAM (as float32) for per-job lookups. The file is
+    scratch space for this store only: `ids` aren't saved with it, so an
+    existing file at `path` is overwritten, not reloaded.
+    """
+    
+    def __init__(
+        self,
+        service: EmbeddingService,
+        initial_capacity: int = 1024,
+        path: Optional[Path] = None,
+        hot_rows: int = 1024
+    ):
+        self.service = service
+        self.path = Path(path) if path is not None else None
+        self.ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        
+        # Hot float32 copies of memmapped rows, LRU order
+        self.hot_rows = hot_rows
+        self._hot: OrderedDict = OrderedDict()
+        
+        self._buffer = self._allocate(initial_capacity)
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    @property
+    def matrix(self) -> np.ndarray:
+        """The filled rows of the embedding matrix (a view, not a copy)"""
+        return self._buffer[:len(self.ids)]
+    
+    def vector(self, job_id: str) -> np.ndarray:
+        """One job's embedding as float32"""
+        row = self._rows[job_id]
+        if self.path is None:
+            return self._buffer[row]
+        
+        vec = self._hot.get(job_id)
+        if vec is not None:
+            self._hot.move_to_end(job_id)
+            return vec
+        
+        vec = self._buffer[row].astype(np.float32)
+        self._hot[job_id] = vec
+        if len(self._hot) > self.hot_rows:
+            self._hot.popitem(last=False)
+        return vec
+    
+    def upsert(self, job_id: str, text: str):
+        """Add or replace a single job's embedding"""
+        self.upsert_many([(job_id, text)])
+    
+    def upsert_many(self, items: List[Tuple[str, str]]):
+        """
+        Add or replace embeddings for (job_id, text) pairs, encoding all
+        texts in one batch.
+        """
+        if not items:
+            return
+        
+        vectors = self.service.encode([text for _, text in items])
+        
+        for (job_id, _), vec in zip(items, vectors):
+            row = self._rows.get(job_id)
+            if row is None:
+                row = len(self.ids)
+                if row == self._buffer.shape[0]:
+                    self._grow()
+                self.ids.append(job_id)
+                self._rows[job_id] = row
+            self._buffer[row] = vec
+            self._hot.pop(job_id, None)
+    
+    def query(self, text: str, top_k: int = 5) -> List[Dict]:
+        """
+        Find the stored jobs most similar to text.
         
-        return ' | '.join(parts)
\ No newline at end of file
+        Returns:
+            List of dicts with 'job_id' and 'similarity' keys, best first
+        """
+        if not self.ids:
+            return []
+        
+        query = self.service.encode(text)[0]
+        
+        if self.path is not None:
+            # float16 on disk: find_best_matches upcasts it block by block
+            return [
+                {'job_id': self.ids[match['index']], 'similarity': match['similarity']}
+                for match in self.service.find_best_matches(query, self.matrix, top_k)
+            ]
+        
+        similarities = self.matrix @ query
+        
+        k = min(top_k, len(similarities))
+        if k <= 0:
+            return []
+        top = np.argpartition(-similarities, k - 1)[:k]
+        top_indices = top[np.argsort(-similarities[top], kind='stable')]
+        
+        return [
+            {'job_id': self.ids[idx], 'similarity': float(similarities[idx])}
+            for idx in top_indices
+        ]
+    
+    def flush(self):
+        """Write pending memmap changes to disk"""
+        if isinstance(self._buffer, np.memmap):
+            self._buffer.flush()
+    
+    def _allocate(self, capacity: int, extend: bool = False) -> np.ndarray:
+        """
+        Create the backing matrix; with extend=True, grow the memmap file
+        in place, keeping its rows
+        """
+        capacity = max(1, capacity)
+        shape = (capacity, self.service.embedding_dim)
+        if self.path is None:
+            return np.empty(shape, dtype=np.float32)
+        
+        # Size the file first; memmap can't open past its end. A new store
+        # starts from an empty file (see the class docstring)
+        mode = 'r+b' if extend else 'w+b'
+        with open(self.path, mode) as f:
+            f.truncate(capacity * self.service.embedding_dim * np.dtype(np.float16).itemsize)
+        return np.memmap(self.path, dtype=np.float16, mode='r+', shape=shape)
+    
+    def _grow(self):
+        """Double the buffer capacity (amortized O(1) appends)"""
+        capacity = 2 * self._buffer.shape[0]
+        if self.path is not None:
+            # The file keeps its rows; just map the larger size
+            self.flush()
+            self._buffer = self._allocate(capacity, extend=True)
+            return
+        
+        grown = self._allocate(capacity)
+        grown[:len(self.ids)] = self.matrix
+        self._buffer = grown
@@ -0,0 +1,47 @@
+# services/keyword_matcher.py
+import re
+from typing import Dict, Iterable, Set
+
+
+class KeywordMatcher:
+    """
+    Find which of a fixed set of keywords occur in a text with one regex scan.
+
+    Matching is case-insensitive substring matching, i.e. the same result as
+    `{kw for kw in keywords if kw.lower() in text.lower()}`, but the keyword set
+    is compiled once and each text is scanned in a single pass instead of once
+    per keyword.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: Set[str] = {kw.lower() for kw in keywords if kw}
+
+        # Longest first so each start position reports its longest keyword;
+        # the lookahead lets matches overlap
+        ordered = sorted(self.keywords, key=len, reverse=True)
+        self._pattern = (
+            re.compile('(?=(' + '|'.join(map(re.escape, ordered)) + '))')
+            if ordered else None
+        )
+
+        # Any keyword that is a substring of a matched keyword is also present
+        self._implied: Dict[str, Set[str]] = {
+            kw: {other for other in self.keywords if other in kw}
+            for kw in self.keywords
+        }
+
+    def find_in(self, text: str, lowered: bool = False) -> Set[str]:
+        """
+        Return the (lowercased) keywords that occur in text; pass
+        lowered=True if text is already lowercase to skip the copy
+        """
+        if self._pattern is None or not text:
+            return set()
+
+        if not lowered:
+            text = text.lower()
+
+        found = set()
+        for hit in {m.group(1) for m in self._pattern.finditer(text)}:
+            found |= self._implied[hit]
+        return found
@@ -1,8 +1,10 @@
 """
 PDF Generator Service for creating ATS-optimized ONE-PAGE resumes
 """
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from types import MappingProxyType
+from typing import List, Mapping, Optional, Tuple
 from datetime import datetime
 import io
 
@@ -17,6 +19,11 @@ from reportlab.platypus import (
 from reportlab.lib import colors
 
 from models.generated_resume import TailoredResumeData, ATSScores
+from services.keyword_matcher import KeywordMatcher
+
+# Weights for the overall ATS score
+KEYWORD_WEIGHT = 0.7
+FORMATTING_WEIGHT = 0.3
 
 
 class PDFGenerator:
@@ -25,10 +32,16 @@ class PDFGenerator:
     def __init__(self, output_dir: Path = Path("./generated_resumes")):
         self.output_dir = output_dir
         self.output_dir.mkdir(parents=True, exist_ok=True)
-        self.styles = self._create_styles()
+        self.styles = PDFGenerator._create_styles()
     
-    def _create_styles(self) -> Dict[str, ParagraphStyle]:
-        """Create custom paragraph styles for ATS optimization - ONE PAGE FORMAT"""
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _create_styles() -> Mapping[str, ParagraphStyle]:
+        """
+        Create custom paragraph styles for ATS optimization - ONE PAGE FORMAT
+        
+        Built once per process and shared (read-only) by all generators.
+        """
         styles = getSampleStyleSheet()
         
         # Compact ATS-optimized styles for one-page resume
@@ -99,7 +112,7 @@ class PDFGenerator:
             )
         }
         
-        return custom_styles
+        return MappingProxyType(custom_styles)
     
     def generate_pdf(
         self,
@@ -113,6 +126,22 @@ class PDFGenerator:
         Returns:
             Tuple of (pdf_bytes, file_path)
         """
+        pdf_bytes = self.render_pdf(resume_data)
+        
+        # Save to disk if requested
+        file_path = self.output_dir / filename
+        if save_to_disk:
+            self.store_pdf(pdf_bytes, file_path)
+        
+        return pdf_bytes, file_path
+    
+    def render_pdf(self, resume_data: TailoredResumeData) -> bytes:
+        """
+        Render resume to PDF bytes in memory (no disk I/O)
+        
+        Returns:
+            PDF file contents
+        """
         # Create PDF in memory with REDUCED MARGINS
         buffer = io.BytesIO()
         doc = SimpleDocTemplate(
@@ -161,12 +190,17 @@ class PDFGenerator:
         pdf_bytes = buffer.getvalue()
         buffer.close()
         
-        # Save to disk if requested
-        file_path = self.output_dir / filename
-        if save_to_disk:
-            file_path.write_bytes(pdf_bytes)
+        return pdf_bytes
+    
+    def store_pdf(self, pdf_bytes: bytes, file_path: Path) -> Path:
+        """
+        Write rendered PDF bytes to disk
         
-        return pdf_bytes, file_path
+        No fsync is issued: PDFs can always be re-rendered from the
+        resume_data stored in the database.
+        """
+        file_path.write_bytes(pdf_bytes)
+        return file_path
     
     def _build_header(self, contact_info: dict) -> List:
         """Build contact information header"""
@@ -337,7 +371,8 @@ class PDFGenerator:
     def calculate_ats_score(
         self,
         resume_data: TailoredResumeData,
-        job_keywords: List[str]
+        job_keywords: List[str],
+        resume_text: Optional[str] = None
     ) -> ATSScores:
         """
         Calculate ATS compatibility scores
@@ -345,31 +380,33 @@ class PDFGenerator:
         Args:
             resume_data: The tailored resume content
             job_keywords: Required keywords from job posting
+            resume_text: search_text(resume_data), when scoring the same
+                resume against several jobs; computed here if omitted
         
         Returns:
             ATSScores with detailed metrics
         """
         # Extract all text from resume
-        resume_text = self._extract_all_text(resume_data).lower()
+        if resume_text is None:
+            resume_text = self.search_text(resume_data)
         
-        # Check keyword matches
+        # Check keyword matches (one scan of the resume for all keywords)
+        found = KeywordMatcher(job_keywords).find_in(resume_text, lowered=True)
         matched = []
         missing = []
         
         for keyword in job_keywords:
-            if keyword.lower() in resume_text:
+            if keyword.lower() in found:
                 matched.append(keyword)
             else:
                 missing.append(keyword)
         
-        # Calculate metrics
-        keyword_match_rate = (len(matched) / len(job_keywords) * 100) if job_keywords else 0
-        
         # Formatting score (ATS-friendly features)
         formatting_score = self._calculate_formatting_score(resume_data)
         
-        # Overall score (weighted average)
-        overall_score = (keyword_match_rate * 0.7) + (formatting_score * 0.3)
+        keyword_match_rate, overall_score = self._aggregate_ats_score(
+            len(matched), len(job_keywords), formatting_score
+        )
         
         # Generate recommendations
         recommendations = self._generate_recommendations(
@@ -387,31 +424,53 @@ class PDFGenerator:
             recommendations=recommendations
         )
     
+    @staticmethod
+    def _aggregate_ats_score(
+        matched_count: int,
+        total_keywords: int,
+        formatting_score: float
+    ) -> Tuple[float, float]:
+        """
+        Fold match counts into (keyword_match_rate, overall_score)
+        
+        Kept separate from the string matching above so the numeric
+        part can be tested and tuned on its own.
+        """
+        keyword_match_rate = (matched_count / total_keywords * 100) if total_keywords else 0
+        overall_score = (keyword_match_rate * KEYWORD_WEIGHT) + (formatting_score * FORMATTING_WEIGHT)
+        return keyword_match_rate, overall_score
+    
+    def search_text(self, resume_data: TailoredResumeData) -> str:
+        """Lowercased resume text that calculate_ats_score matches keywords against"""
+        return self._extract_all_text(resume_data).lower()
+    
     def _extract_all_text(self, resume_data: TailoredResumeData) -> str:
         """Extract all text content from resume for keyword analysis"""
-        text_parts = [resume_data.professional_summary]
+        return " ".join(part for part in self._iter_text_parts(resume_data) if part)
+    
+    @staticmethod
+    def _iter_text_parts(resume_data: TailoredResumeData):
+        """Yield each text field of the resume in document order"""
+        yield resume_data.professional_summary
         
         # Skills
-        text_parts.extend(resume_data.skills)
+        yield from resume_data.skills
         
         # Experience
         for exp in resume_data.experience:
-            text_parts.append(exp.get('title', ''))
-            text_parts.append(exp.get('company', ''))
-            text_parts.extend(exp.get('responsibilities', []))
+            yield exp.get('title', '')
+            yield exp.get('company', '')
+            yield from exp.get('responsibilities', [])
         
         # Education
         for edu in resume_data.education:
-            text_parts.append(edu.get('degree', ''))
-            text_parts.append(edu.get('institution', ''))
+            yield edu.get('degree', '')
+            yield edu.get('institution', '')
         
         # Projects
-        if resume_data.projects:
-            for proj in resume_data.projects:
-                text_parts.append(proj.get('name', ''))
-                text_parts.append(proj.get('description', ''))
-        
-        return " ".join(filter(None, text_parts))
+        for proj in resume_data.projects or ():
+            yield proj.get('name', '')
+            yield proj.get('description', '')
     
     def _calculate_formatting_score(self, resume_data: TailoredResumeData) -> float:
         """Calculate formatting score based on ATS-friendly features"""
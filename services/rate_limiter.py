@@ -18,30 +18,40 @@ class RateLimiter:
         self.rpm = requests_per_minute
         self.burst_size = burst_size or requests_per_minute
         self.tokens = self.burst_size
-        self.last_update = time.time()
+        self.last_update = time.monotonic()
         self.lock = asyncio.Lock()
         
-        # Track request timestamps for logging
-        self.requests = deque(maxlen=100)
+        # Timestamps of requests in the last minute (oldest first), for stats
+        self.requests = deque()
         
     async def acquire(self) -> None:
         """Acquire a token, waiting if necessary."""
         async with self.lock:
             await self._refill_tokens()
             
-            while self.tokens < 1:
-                # Wait until we have a token
-                wait_time = (1 / self.rpm) * 60
-                logger.debug(f"Rate limit reached, waiting {wait_time:.2f}s")
-                await asyncio.sleep(wait_time)
-                await self._refill_tokens()
-            
+            # Reserve a token up front. If the bucket is empty this drives it
+            # negative, and the caller sleeps exactly until its token has
+            # accrued - one wakeup per waiter, in arrival order, without
+            # holding the lock while asleep.
             self.tokens -= 1
-            self.requests.append(time.time())
+            wait_time = -self.tokens * 60 / self.rpm if self.tokens < 0 else 0.0
+        
+        if wait_time > 0:
+            logger.debug(f"Rate limit reached, waiting {wait_time:.2f}s")
+            try:
+                await asyncio.sleep(wait_time)
+            except asyncio.CancelledError:
+                # Hand the reserved token back to later callers
+                self.tokens += 1
+                raise
+        
+        now = time.monotonic()
+        self.requests.append(now)
+        self._prune_requests(now)
             
     async def _refill_tokens(self) -> None:
         """Refill tokens based on elapsed time."""
-        now = time.time()
+        now = time.monotonic()
         elapsed = now - self.last_update
         
         # Add tokens based on time elapsed
@@ -49,14 +59,18 @@ class RateLimiter:
         self.tokens = min(self.burst_size, self.tokens + new_tokens)
         self.last_update = now
         
+    def _prune_requests(self, now: float) -> None:
+        """Drop timestamps older than a minute (amortized O(1))."""
+        while self.requests and now - self.requests[0] >= 60:
+            self.requests.popleft()
+        
     def get_stats(self) -> dict:
         """Get rate limiter statistics."""
-        now = time.time()
-        recent_requests = [r for r in self.requests if now - r < 60]
+        self._prune_requests(time.monotonic())
         
         return {
-            "available_tokens": self.tokens,
-            "requests_last_minute": len(recent_requests),
+            "available_tokens": max(0, self.tokens),
+            "requests_last_minute": len(self.requests),
             "rpm_limit": self.rpm,
         }
 
@@ -1,14 +1,21 @@
 """
 Resume Service - Integrates PDF generation with database operations
 """
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Dict
+from typing import AsyncIterator, List, Optional, Dict, Tuple
 from uuid import UUID
+import asyncio
 import asyncpg
+import hashlib
 import json
+import multiprocessing
+import os
 from datetime import datetime
 
 from services.pdf_generator import PDFGenerator
+from services.keyword_matcher import KeywordMatcher
 from repositories.resume_repository import ResumeRepository
 from models.generated_resume import (
     TailoredResumeData,
@@ -16,6 +23,43 @@ from models.generated_resume import (
     GeneratedResume
 )
 
+# Tailored resumes + ATS scores kept in memory (by content key)
+GENERATION_CACHE_SIZE = 512
+
+# Rendered PDFs kept in output_dir/.cache (least recently used pruned first)
+PDF_CACHE_MAX_FILES = 512
+
+# Batches at least this big render PDFs in worker processes; smaller ones
+# render on a thread, since starting the processes (~0.4 s) costs more than
+# rendering a few resumes (a few ms each)
+PDF_POOL_MIN_BATCH = 100
+
+# PDFGenerator of a render worker process (one per process, created on first use)
+_worker_pdf_generator: Optional[PDFGenerator] = None
+
+
+def _render_pdf(resume_data: TailoredResumeData, output_dir: Path) -> bytes:
+    """Render a resume to PDF bytes; runs in a ResumeService render process"""
+    global _worker_pdf_generator
+    if _worker_pdf_generator is None:
+        _worker_pdf_generator = PDFGenerator(output_dir)
+    return _worker_pdf_generator.render_pdf(resume_data)
+
+
+# Technologies looked for in job requirements
+# (simple keyword extraction - in production, use NLP)
+COMMON_TECH: Tuple[str, ...] = (
+    'Python', 'PyTorch', 'TensorFlow', 'Machine Learning', 'Deep Learning',
+    'NLP', 'LLM', 'AI', 'AWS', 'Docker', 'Kubernetes', 'REST API',
+    'PostgreSQL', 'Redis', 'Git', 'CI/CD', 'Agile', 'RAG'
+)
+
+# (name, lowercase name) pairs, lowercased once at import
+COMMON_TECH_LOWER: Tuple[Tuple[str, str], ...] = tuple((tech, tech.lower()) for tech in COMMON_TECH)
+
+# Finds every COMMON_TECH entry in one scan of the requirements
+COMMON_TECH_MATCHER = KeywordMatcher(COMMON_TECH)
+
 
 class ResumeService:
     """High-level service for resume generation and management"""
@@ -25,6 +69,21 @@ class ResumeService:
         self.repository = ResumeRepository(db_pool)
         self.pdf_generator = PDFGenerator(output_dir)
         self.output_dir = output_dir
+        
+        # Generation results keyed by _generation_key(); rendered PDFs are
+        # also kept under output_dir/.cache so other processes can reuse them
+        self._generation_cache: OrderedDict = OrderedDict()
+        self.pdf_cache_dir = output_dir / ".cache"
+        self.pdf_cache_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Worker processes for rendering large batches, started on first use
+        self._pdf_pool: Optional[ProcessPoolExecutor] = None
+    
+    def close(self):
+        """Shut down the PDF render processes (if started)"""
+        if self._pdf_pool is not None:
+            self._pdf_pool.shutdown()
+            self._pdf_pool = None
     
     async def generate_resume_for_job(
         self,
@@ -43,46 +102,113 @@ class ResumeService:
         Returns:
             Dictionary with resume details or None if failed
         """
+        # Existing-resume check, job and user profile in one round trip
+        existing_id, job_data, user_profile = await self._fetch_generation_inputs(
+            user_profile_id, job_id
+        )
+        
+        return await self._generate_resume_from_data(
+            user_profile_id, job_id, user_profile, job_data, existing_id, store_pdf_in_db
+        )
+    
+    async def _generate_resume_from_data(
+        self,
+        user_profile_id: UUID,
+        job_id: UUID,
+        user_profile: Optional[Dict],
+        job_data: Optional[Dict],
+        existing_id: Optional[UUID],
+        store_pdf_in_db: bool,
+        pdf_workers: int = 0
+    ) -> Optional[Dict]:
+        """
+        Generate a resume from already-fetched job and profile data
+        
+        The only database work left is loading an existing resume (when
+        existing_id is set) or inserting the new one. pdf_workers is passed
+        on to _generate_pdf_cached.
+        """
         # Check if resume already exists
-        existing = await self.repository.get_by_user_and_job(user_profile_id, job_id)
+        existing = await self._load_existing(existing_id)
         if existing:
-            print(f"Resume already exists for this job: {existing.filename}")
-            return self._resume_to_dict(existing)
+            return existing
+        
+        resume_create = await self._prepare_resume(
+            user_profile_id, job_id, user_profile, job_data, store_pdf_in_db, pdf_workers
+        )
+        if resume_create is None:
+            return None
         
-        # Fetch job and user profile data
-        job_data = await self._fetch_job(job_id)
+        # Save to database
+        generated_resume = await self.repository.create(resume_create)
+        
+        return self._resume_to_dict(generated_resume, job_data)
+    
+    async def _load_existing(self, existing_id: Optional[UUID]) -> Optional[Dict]:
+        """Details of an already-generated resume, if there is one"""
+        if not existing_id:
+            return None
+        existing = await self.repository.get_by_id(existing_id)
+        if not existing:
+            return None
+        print(f"Resume already exists for this job: {existing.filename}")
+        return self._resume_to_dict(existing)
+    
+    async def _prepare_resume(
+        self,
+        user_profile_id: UUID,
+        job_id: UUID,
+        user_profile: Optional[Dict],
+        job_data: Optional[Dict],
+        store_pdf_in_db: bool,
+        pdf_workers: int = 0
+    ) -> Optional[GeneratedResumeCreate]:
+        """
+        Tailor, score and render a resume; returns the row to insert
+        (None if the job or profile is missing). pdf_workers is passed on
+        to _generate_pdf_cached.
+        """
         if not job_data:
             print(f"Job {job_id} not found")
             return None
         
-        user_profile = await self._fetch_user_profile(user_profile_id)
         if not user_profile:
             print(f"User profile {user_profile_id} not found")
             return None
         
-        # Tailor resume to job
-        resume_data = await self._tailor_resume(user_profile, job_data)
-        
-        # Extract job keywords for ATS scoring
-        job_keywords = self._extract_job_keywords(job_data)
-        
-        # Calculate ATS scores
-        ats_scores = self.pdf_generator.calculate_ats_score(resume_data, job_keywords)
+        # Reuse the tailoring if neither the profile nor the job changed
+        cache_key = self._generation_key(user_profile_id, job_id, user_profile, job_data)
+        cached = self._generation_cache.get(cache_key)
+        if cached:
+            self._generation_cache.move_to_end(cache_key)
+            resume_data, ats_scores = cached
+        else:
+            # Extract job keywords (used for tailoring and ATS scoring)
+            job_keywords = self._extract_job_keywords(job_data)
+            
+            # Tailor resume to job
+            resume_data = await self._tailor_resume(user_profile, job_data, job_keywords)
+            
+            # Calculate ATS scores
+            ats_scores = self.pdf_generator.calculate_ats_score(resume_data, job_keywords)
+            
+            self._generation_cache[cache_key] = (resume_data, ats_scores)
+            if len(self._generation_cache) > GENERATION_CACHE_SIZE:
+                self._generation_cache.popitem(last=False)
         
-        # Generate filename
+        # Generate filename (job id suffix keeps concurrent same-company
+        # resumes generated in the same second apart)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         company = job_data.get('company', 'Unknown').replace(' ', '_')
-        filename = f"resume_{company}_{timestamp}.pdf"
+        filename = f"resume_{company}_{timestamp}_{str(job_id)[:8]}.pdf"
         
-        # Generate PDF
-        pdf_bytes, file_path = self.pdf_generator.generate_pdf(
-            resume_data=resume_data,
-            filename=filename,
-            save_to_disk=True
+        # Render (or reuse) and write the PDF
+        pdf_bytes, file_path = await self._generate_pdf_cached(
+            cache_key, resume_data, filename, pdf_workers
         )
         
         # Prepare database entry
-        resume_create = GeneratedResumeCreate(
+        return GeneratedResumeCreate(
             user_profile_id=user_profile_id,
             job_id=job_id,
             filename=filename,
@@ -95,11 +221,99 @@ class ResumeService:
             missing_keywords=ats_scores.missing_keywords,
             pdf_data=pdf_bytes if store_pdf_in_db else None
         )
+    
+    async def _generate_pdf_cached(
+        self,
+        cache_key: str,
+        resume_data: TailoredResumeData,
+        filename: str,
+        pdf_workers: int = 0
+    ) -> Tuple[bytes, Path]:
+        """
+        Render the PDF (or reuse a previous rendering) and write it to filename
         
-        # Save to database
-        generated_resume = await self.repository.create(resume_create)
+        Renders on a worker thread, or with pdf_workers > 0 (large batches,
+        see _batch_pdf_workers) in a pool of that many worker processes.
+        """
+        cached_path = self.pdf_cache_dir / f"{cache_key}.pdf"
+        file_path = self.output_dir / filename
         
-        return self._resume_to_dict(generated_resume, job_data)
+        if cached_path.exists():
+            pdf_bytes = await asyncio.to_thread(self._read_cached_pdf, cached_path)
+            await asyncio.to_thread(self.pdf_generator.store_pdf, pdf_bytes, file_path)
+            return pdf_bytes, file_path
+        
+        if pdf_workers > 0:
+            # ReportLab layout is CPU-bound and holds the GIL: worker processes
+            # let a large batch render on several cores
+            if self._pdf_pool is None:
+                self._pdf_pool = ProcessPoolExecutor(
+                    max_workers=pdf_workers,
+                    # Don't fork a process that has an event loop and threads running
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            pdf_bytes = await asyncio.get_running_loop().run_in_executor(
+                self._pdf_pool, _render_pdf, resume_data, self.output_dir
+            )
+        else:
+            # Off the event loop, without the process start-up cost
+            pdf_bytes = await asyncio.to_thread(self.pdf_generator.render_pdf, resume_data)
+        
+        await asyncio.to_thread(self._store_pdf_copies, pdf_bytes, file_path, cached_path)
+        await asyncio.to_thread(self._prune_pdf_cache)
+        return pdf_bytes, file_path
+    
+    def _store_pdf_copies(self, pdf_bytes: bytes, *paths: Path):
+        """Write the same PDF bytes to each path"""
+        for path in paths:
+            self.pdf_generator.store_pdf(pdf_bytes, path)
+    
+    @staticmethod
+    def _read_cached_pdf(cached_path: Path) -> bytes:
+        """Read a cached PDF and mark it recently used (for pruning)"""
+        pdf_bytes = cached_path.read_bytes()
+        os.utime(cached_path)
+        return pdf_bytes
+    
+    def _prune_pdf_cache(self):
+        """Keep at most PDF_CACHE_MAX_FILES cached PDFs, dropping the least recently used"""
+        cached = list(self.pdf_cache_dir.glob("*.pdf"))
+        if len(cached) <= PDF_CACHE_MAX_FILES:
+            return
+        
+        def last_used(path: Path) -> float:
+            try:
+                return path.stat().st_mtime
+            except FileNotFoundError:
+                return 0.0
+        
+        cached.sort(key=last_used)
+        for path in cached[:len(cached) - PDF_CACHE_MAX_FILES]:
+            path.unlink(missing_ok=True)
+    
+    @staticmethod
+    def _generation_key(
+        user_profile_id: UUID,
+        job_id: UUID,
+        user_profile: Dict,
+        job_data: Dict
+    ) -> str:
+        """
+        Cache key for a generated resume: changes whenever any profile field
+        or any job field used for tailoring changes
+        """
+        # The whole profile, not updated_at: nothing keeps that column current
+        # when profile fields are rewritten (e.g. populate_profile.py)
+        parts = (
+            str(user_profile_id),
+            str(job_id),
+            json.dumps(user_profile, sort_keys=True, default=str),
+            job_data.get('title') or '',
+            job_data.get('company') or '',
+            job_data.get('requirements') or '',
+            job_data.get('description') or '',
+        )
+        return hashlib.sha1('\0'.join(parts).encode()).hexdigest()
     
     async def generate_batch_resumes(
         self,
@@ -120,70 +334,207 @@ class ResumeService:
         Returns:
             List of generated resume details
         """
-        # Fetch top-scored jobs
-        top_jobs = await self._fetch_top_jobs(user_profile_id, min_score, limit)
-        
+        user_profile, top_jobs = await self._load_batch(user_profile_id, min_score, limit)
         if not top_jobs:
-            print(f"No jobs found with score >= {min_score}")
             return []
         
-        print(f"Found {len(top_jobs)} jobs to process")
+        # Generate resumes concurrently, at most one job per pool connection;
+        # new rows are inserted together once all jobs are done
+        concurrency = max(1, min(limit, self.pool.get_max_size()))
+        sem = asyncio.Semaphore(concurrency)
+        pdf_workers = self._batch_pdf_workers(len(top_jobs), concurrency)
         
-        # Generate resumes for each job
-        results = []
-        for job_data in top_jobs:
-            job_id = job_data['id']
-            
-            print(f"Generating resume for: {job_data.get('title', 'Unknown')} at {job_data.get('company', 'Unknown')}")
-            
-            result = await self.generate_resume_for_job(
-                user_profile_id=user_profile_id,
-                job_id=job_id,
-                store_pdf_in_db=store_pdf_in_db
-            )
-            
-            if result:
-                results.append(result)
+        async def generate_one(job_data: Dict):
+            async with sem:
+                print(f"Generating resume for: {job_data.get('title', 'Unknown')} at {job_data.get('company', 'Unknown')}")
+                existing = await self._load_existing(job_data.pop('existing_id'))
+                if existing:
+                    return existing
+                return await self._prepare_resume(
+                    user_profile_id,
+                    job_data['id'],
+                    user_profile,
+                    job_data,
+                    store_pdf_in_db,
+                    pdf_workers
+                )
+        
+        outcomes = await asyncio.gather(
+            *(generate_one(job_data) for job_data in top_jobs),
+            return_exceptions=True
+        )
+        
+        # Keep top_jobs order; one failed job doesn't sink the batch
+        results: List[Optional[Dict]] = []
+        pending = []  # (position in results, row to insert, job_data)
+        for job_data, outcome in zip(top_jobs, outcomes):
+            if isinstance(outcome, Exception):
+                print(f"Failed to generate resume for job {job_data['id']}: {outcome}")
+            elif isinstance(outcome, GeneratedResumeCreate):
+                pending.append((len(results), outcome, job_data))
+                results.append(None)
+            elif outcome:
+                results.append(outcome)
+        
+        # Save all new resumes in one batch; rows another run inserted first
+        # are skipped and reported like any other failed job
+        created = await self.repository.create_many([resume for _, resume, _ in pending])
+        for (position, _, job_data), generated_resume in zip(pending, created):
+            if generated_resume is None:
+                print(f"Failed to save resume for job {job_data['id']}: a resume for this job already exists")
+            else:
+                results[position] = self._resume_to_dict(generated_resume, job_data)
+        
+        return [result for result in results if result is not None]
+    
+    async def generate_resumes_stream(
+        self,
+        user_profile_id: UUID,
+        min_score: float = 70.0,
+        limit: int = 10,
+        store_pdf_in_db: bool = False
+    ) -> AsyncIterator[Dict]:
+        """
+        Generate resumes for top-scored jobs, yielding each one as soon as
+        it's ready
+        
+        Same arguments as generate_batch_resumes; each new resume is saved on
+        its own (instead of in one batch at the end) so it can be yielded
+        right away.
+        
+        Yields:
+            Generated resume details, in completion order
+        """
+        user_profile, top_jobs = await self._load_batch(user_profile_id, min_score, limit)
+        if not top_jobs:
+            return
         
-        return results
+        concurrency = max(1, min(limit, self.pool.get_max_size()))
+        sem = asyncio.Semaphore(concurrency)
+        pdf_workers = self._batch_pdf_workers(len(top_jobs), concurrency)
+        
+        async def generate_one(job_data: Dict) -> Optional[Dict]:
+            async with sem:
+                print(f"Generating resume for: {job_data.get('title', 'Unknown')} at {job_data.get('company', 'Unknown')}")
+                try:
+                    return await self._generate_resume_from_data(
+                        user_profile_id,
+                        job_data['id'],
+                        user_profile,
+                        job_data,
+                        job_data.pop('existing_id'),
+                        store_pdf_in_db,
+                        pdf_workers
+                    )
+                except Exception as e:
+                    # One failed job doesn't end the stream
+                    print(f"Failed to generate resume for job {job_data['id']}: {e}")
+                    return None
+        
+        tasks = [asyncio.ensure_future(generate_one(job_data)) for job_data in top_jobs]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                result = await next_done
+                if result:
+                    yield result
+        finally:
+            # Consumer stopped early: don't leave work running
+            for task in tasks:
+                task.cancel()
+    
+    @staticmethod
+    def _batch_pdf_workers(job_count: int, concurrency: int) -> int:
+        """
+        Render processes worth starting for a batch: none below
+        PDF_POOL_MIN_BATCH jobs, otherwise one per concurrent job (up to
+        one per CPU)
+        """
+        if job_count < PDF_POOL_MIN_BATCH:
+            return 0
+        workers = min(concurrency, os.cpu_count() or 1)
+        return workers if workers > 1 else 0
     
-    async def _fetch_job(self, job_id: UUID) -> Optional[Dict]:
-        """Fetch job details from database"""
+    async def _load_batch(
+        self,
+        user_profile_id: UUID,
+        min_score: float,
+        limit: int
+    ) -> Tuple[Optional[Dict], List[Dict]]:
+        """
+        Fetch the profile and top-scored jobs for a batch; the job list is
+        empty if there is nothing to generate
+        """
+        # Profile, top-scored jobs and their existing resumes in one query
+        user_profile, top_jobs = await self._fetch_batch_context(user_profile_id, min_score, limit)
+        
+        if not top_jobs:
+            print(f"No jobs found with score >= {min_score}")
+            return user_profile, []
+        
+        if not user_profile:
+            print(f"User profile {user_profile_id} not found")
+            return None, []
+        
+        print(f"Found {len(top_jobs)} jobs to process")
+        return user_profile, top_jobs
+    
+    async def _fetch_generation_inputs(
+        self,
+        user_profile_id: UUID,
+        job_id: UUID
+    ) -> Tuple[Optional[UUID], Optional[Dict], Optional[Dict]]:
+        """
+        Fetch (existing resume id, job, user profile) with a single query
+        
+        Any of the three is None when the corresponding row doesn't exist.
+        """
         query = """
             SELECT 
+                (SELECT gr.id FROM generated_resumes gr
+                  WHERE gr.user_profile_id = $1 AND gr.job_id = $2
+                  ORDER BY gr.created_at DESC
+                  LIMIT 1) AS existing_id,
+                (SELECT to_jsonb(u) FROM user_profile u WHERE u.id = $1) AS user_profile,
                 j.id, j.title, j.company, j.location, j.description,
                 j.requirements, j.salary_min, j.salary_max,
                 js.total_score, js.skill_match_score
-            FROM jobs j
-            LEFT JOIN job_scores js ON j.id = js.job_id
-            WHERE j.id = $1
+            FROM (SELECT 1) AS one
+            LEFT JOIN jobs j ON j.id = $2
+            LEFT JOIN job_scores js ON js.job_id = j.id AND js.user_profile_id = $1
         """
         
         async with self.pool.acquire() as conn:
-            row = await conn.fetchrow(query, job_id)
-            if row:
-                return dict(row)
-            return None
-    
-    async def _fetch_user_profile(self, user_profile_id: UUID) -> Optional[Dict]:
-        """Fetch user profile from database"""
-        query = "SELECT * FROM user_profile WHERE id = $1"
+            row = await conn.fetchrow(query, user_profile_id, job_id)
         
-        async with self.pool.acquire() as conn:
-            row = await conn.fetchrow(query, user_profile_id)
-            if row:
-                return dict(row)
-            return None
+        job_data = dict(row)
+        existing_id = job_data.pop('existing_id')
+        user_profile = job_data.pop('user_profile')
+        
+        # Pools with the JSONB codec hand back a dict, plain pools the JSON text
+        if isinstance(user_profile, str):
+            user_profile = json.loads(user_profile)
+        
+        return existing_id, (job_data if job_data['id'] is not None else None), user_profile
     
-    async def _fetch_top_jobs(
+    async def _fetch_batch_context(
         self,
         user_profile_id: UUID,
         min_score: float,
         limit: int
-    ) -> List[Dict]:
-        """Fetch top-scored jobs for user"""
+    ) -> Tuple[Optional[Dict], List[Dict]]:
+        """
+        Fetch the user profile and top-scored jobs for user with one query
+        
+        Each job dict carries 'existing_id', the newest already-generated
+        resume for that job (or None).
+        """
         query = """
             SELECT 
+                (SELECT to_jsonb(u) FROM user_profile u WHERE u.id = $1) AS user_profile,
+                (SELECT gr.id FROM generated_resumes gr
+                  WHERE gr.user_profile_id = $1 AND gr.job_id = j.id
+                  ORDER BY gr.created_at DESC
+                  LIMIT 1) AS existing_id,
                 j.id, j.title, j.company, j.location, j.description,
                 j.requirements, j.salary_min, j.salary_max,
                 js.total_score, js.skill_match_score
@@ -196,40 +547,39 @@ class ResumeService:
         
         async with self.pool.acquire() as conn:
             rows = await conn.fetch(query, user_profile_id, min_score, limit)
-            return [dict(row) for row in rows]
+        
+        top_jobs = [dict(row) for row in rows]
+        
+        # The (uncorrelated) profile is the same on every row
+        user_profile = None
+        for job_data in top_jobs:
+            user_profile = job_data.pop('user_profile')
+        
+        # Pools with the JSONB codec hand back a dict, plain pools the JSON text
+        if isinstance(user_profile, str):
+            user_profile = json.loads(user_profile)
+        
+        return user_profile, top_jobs
     
     async def _tailor_resume(
         self,
         user_profile: Dict,
-        job_data: Dict
+        job_data: Dict,
+        job_keywords: Optional[List[str]] = None
     ) -> TailoredResumeData:
         """
         Tailor resume content to match job requirements
         
         This is a simplified version. In production, you'd use an LLM
-        to intelligently tailor the content.
+        to intelligently tailor the content. job_keywords, if the caller
+        already has them, skips re-extracting them from job_data.
         """
-        # Extract user data - parse JSON fields if they're strings
-        skills = user_profile.get('skills', [])
-        if isinstance(skills, str):
-            skills = json.loads(skills)
-        
-        experience = user_profile.get('experience', [])
-        if isinstance(experience, str):
-            experience = json.loads(experience)
-        
-        education = user_profile.get('education', [])
-        if isinstance(education, str):
-            education = json.loads(education)
-        
-        # Parse certifications and projects
-        certifications = user_profile.get('certifications', [])
-        if isinstance(certifications, str):
-            certifications = json.loads(certifications)
-        
-        projects = user_profile.get('projects', [])
-        if isinstance(projects, str):
-            projects = json.loads(projects)
+        # Extract user data (JSONB columns, already decoded by the fetch)
+        skills = user_profile.get('skills') or []
+        experience = user_profile.get('experience') or []
+        education = user_profile.get('education') or []
+        certifications = user_profile.get('certifications') or []
+        projects = user_profile.get('projects') or []
         
         # Create contact info
         contact_info = {
@@ -246,17 +596,24 @@ class ResumeService:
         professional_summary = f"Results-driven AI/ML Engineer with 3 years of experience in {job_title.lower()} and related fields. Specialized in Python, Machine Learning, Deep Learning, NLP, and AI Agents. Proven track record of delivering production-grade AI solutions using PyTorch, TensorFlow, and modern LLM frameworks. Seeking to leverage expertise in a remote {job_title} role."
         
         # Extract job keywords and inject into skills
-        job_keywords = self._extract_job_keywords(job_data)
-        enhanced_skills = list(set(skills + [kw for kw in job_keywords if kw.lower() not in [s.lower() for s in skills]]))
+        if job_keywords is None:
+            job_keywords = self._extract_job_keywords(job_data)
+        
+        # Merge keyed by lowercase name: profile skills keep their order (and
+        # lead the list), job keywords the user doesn't list are appended
+        merged_skills: Dict[str, str] = {}
+        for skill in (*skills, *job_keywords):
+            merged_skills.setdefault(skill.lower(), skill)
+        enhanced_skills = list(merged_skills.values())
         
         return TailoredResumeData(
             contact_info=contact_info,
             professional_summary=professional_summary,
-            experience=experience or [],
-            education=education or [],
+            experience=experience,
+            education=education,
             skills=enhanced_skills,
-            certifications=certifications or [],
-            projects=projects or [],
+            certifications=certifications,
+            projects=projects,
             keywords_injected=job_keywords
         )
     
@@ -267,24 +624,16 @@ class ResumeService:
         # Extract from requirements
         requirements = job_data.get('requirements', '')
         if requirements:
-            # Simple keyword extraction (in production, use NLP)
-            common_tech = [
-                'Python', 'PyTorch', 'TensorFlow', 'Machine Learning', 'Deep Learning',
-                'NLP', 'LLM', 'AI', 'AWS', 'Docker', 'Kubernetes', 'REST API',
-                'PostgreSQL', 'Redis', 'Git', 'CI/CD', 'Agile', 'RAG'
-            ]
-            
-            requirements_lower = requirements.lower()
-            for tech in common_tech:
-                if tech.lower() in requirements_lower:
-                    keywords.append(tech)
+            found = COMMON_TECH_MATCHER.find_in(requirements)
+            keywords.extend(tech for tech, tech_lower in COMMON_TECH_LOWER if tech_lower in found)
         
         # Extract from description
         description = job_data.get('description', '')
         if 'remote' in description.lower():
             keywords.append('Remote Work')
         
-        return list(set(keywords))
+        # Already unique: COMMON_TECH has no duplicates
+        return keywords
     
     def _resume_to_dict(self, resume: GeneratedResume, job_data: Optional[Dict] = None) -> Dict:
         """Convert GeneratedResume to dictionary for CLI output"""
@@ -2,8 +2,15 @@
 Resume Tailoring Service
 Uses LLM to tailor resumes for specific job postings
 """
+import asyncio
+import hashlib
+import heapq
 import logging
-from typing import List, Dict, Optional
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import islice
+from typing import AsyncIterator, List, Dict, Optional, Tuple
+from uuid import UUID
 import re
 
 from models.resume import (
@@ -12,9 +19,38 @@ from models.resume import (
 )
 from models.job import Job
 from models.user_profile import UserProfile
+from services.keyword_matcher import KeywordMatcher
 
 logger = logging.getLogger(__name__)
 
+# Description phrases that introduce a skill, e.g. "experience with X" and
+# "proficient in X". Kept as two patterns: the greedy capture can run over a
+# following phrase, so one alternation would drop matches the second scan finds
+EXPERIENCE_PATTERN = re.compile(r'experience\s+(?:with|in|using)\s+([a-z][a-z0-9\s\.\+#-]+)')
+PROFICIENT_PATTERN = re.compile(r'(?:proficient|expert|skilled)\s+(?:in|with)\s+([a-z][a-z0-9\s\.\+#-]+)')
+
+
+@lru_cache(maxsize=1024)
+def _description_keywords(description: str) -> Tuple[str, ...]:
+    """Skill words introduced by the phrases above, in match order"""
+    keywords = []
+    for pattern in (EXPERIENCE_PATTERN, PROFICIENT_PATTERN):
+        for match in pattern.finditer(description):
+            keyword = match.group(1).strip().split()[0]  # First word
+            if len(keyword) > 2:
+                keywords.append(keyword)
+    return tuple(keywords)
+
+
+# Soft-skill categories: (job/user keywords, phrase used in the summary)
+SOFT_SKILLS: Dict[str, Tuple[Tuple[str, ...], str]] = {
+    'leadership': (('leadership', 'lead', 'mentor', 'mentoring', 'team lead'), 'leadership'),
+    'communication': (('communication', 'collaborate', 'collaboration', 'stakeholder'), 'strong communication'),
+    'architecture': (('architecture', 'system design', 'design', 'architect'), 'system architecture'),
+    'agile': (('agile', 'scrum', 'sprint'), 'Agile methodologies')
+}
+SOFT_SKILL_MATCHER = KeywordMatcher(kw for keywords, _ in SOFT_SKILLS.values() for kw in keywords)
+
 
 class ResumeTailoringService:
     """Service for tailoring resumes to specific jobs"""
@@ -23,6 +59,10 @@ class ResumeTailoringService:
         """Initialize the resume tailoring service"""
         self.max_summary_length = 150  # words
         self.max_bullets_per_job = 4
+        
+        # Exact-match cache of tailored resumes, keyed by _cache_key()
+        self.cache_size = 512
+        self._cache: "OrderedDict[str, TailoredResume]" = OrderedDict()
     
     async def tailor_resume(
         self,
@@ -41,18 +81,113 @@ class ResumeTailoringService:
         Returns:
             Tailored resume
         """
+        return await self._tailor(
+            base_resume,
+            job,
+            user_profile,
+            self._extract_job_keywords(job)
+        )
+    
+    async def tailor_resume_batch(
+        self,
+        base_resume: BaseResume,
+        jobs: List[Job],
+        user_profile: UserProfile,
+        max_concurrency: int = 8
+    ) -> List[TailoredResume]:
+        """
+        Tailor a resume for many jobs in one call
+        
+        Args:
+            base_resume: User's base resume
+            jobs: Jobs to tailor for
+            user_profile: User's profile
+            max_concurrency: Max tailoring calls in flight at once
+            
+        Returns:
+            Tailored resumes, in the same order as jobs
+        """
+        tailored: List[Optional[TailoredResume]] = [None] * len(jobs)
+        async for index, tailored_resume in self.tailor_resume_stream(
+            base_resume, jobs, user_profile, max_concurrency
+        ):
+            tailored[index] = tailored_resume
+        return tailored
+    
+    async def tailor_resume_stream(
+        self,
+        base_resume: BaseResume,
+        jobs: List[Job],
+        user_profile: UserProfile,
+        max_concurrency: int = 8
+    ) -> AsyncIterator[Tuple[int, TailoredResume]]:
+        """
+        Tailor a resume for many jobs, yielding each result as soon as it's ready
+        
+        Yields:
+            (index into jobs, tailored resume), in completion order
+        """
+        logger.info(f"Tailoring resume for {len(jobs)} jobs")
+        
+        # One matcher over every job's keywords, compiled once for the batch
+        keywords_per_job = [self._extract_job_keywords(job) for job in jobs]
+        keyword_matcher = KeywordMatcher(kw for kws in keywords_per_job for kw in kws)
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def tailor(index: int, job: Job, job_keywords: List[str]) -> Tuple[int, TailoredResume]:
+            async with semaphore:
+                return index, await self._tailor(
+                    base_resume, job, user_profile, job_keywords, keyword_matcher
+                )
+        
+        tasks = [
+            asyncio.ensure_future(tailor(i, job, kws))
+            for i, (job, kws) in enumerate(zip(jobs, keywords_per_job))
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Consumer stopped early or a job failed: don't leave work running
+            for task in tasks:
+                task.cancel()
+    
+    async def _tailor(
+        self,
+        base_resume: BaseResume,
+        job: Job,
+        user_profile: UserProfile,
+        job_keywords: List[str],
+        keyword_matcher: Optional[KeywordMatcher] = None
+    ) -> TailoredResume:
+        """Tailor a resume given the job's already-extracted keywords"""
+        cache_key = self._cache_key(base_resume, job, user_profile)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            # Same inputs (e.g. a reposted job): reuse, pointing at this job
+            self._cache.move_to_end(cache_key)
+            logger.debug(f"Tailoring cache hit for job: {job.title} at {job.company}")
+            # model_copy(update=...) skips validation: coerce ids from
+            # model_construct()-built jobs (e.g. str) to the UUID field type
+            job_id = job.id if isinstance(job.id, UUID) else UUID(str(job.id))
+            return cached.model_copy(update={'job_id': job_id})
+        
         logger.info(f"Tailoring resume for job: {job.title} at {job.company}")
         
-        # 1. Analyze job requirements
-        job_keywords = self._extract_job_keywords(job)
+        # 1. Analyze job requirements (lowercased skill views are computed
+        # once here and shared by the steps below)
         required_skills = set(s.lower() for s in job.skills)
+        user_skills_lower = [s.lower() for s in user_profile.skills]
         
         # 2. Tailor professional summary
         tailored_summary = self._tailor_summary(
             base_resume.summary,
             job,
             user_profile,
-            job_keywords
+            job_keywords,
+            required_skills,
+            user_skills_lower
         )
         
         # 3. Select and optimize work experience
@@ -81,7 +216,8 @@ class ResumeTailoringService:
             tailored_summary,
             relevant_experience,
             relevant_projects,
-            job_keywords
+            job_keywords,
+            keyword_matcher
         )
         
         # 7. Create tailored resume
@@ -96,47 +232,66 @@ class ResumeTailoringService:
             tailoring_strategy=self._generate_strategy(job, required_skills)
         )
         
+        self._cache[cache_key] = tailored_resume
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        
         return tailored_resume
     
+    def _cache_key(
+        self,
+        base_resume: BaseResume,
+        job: Job,
+        user_profile: UserProfile
+    ) -> str:
+        """Hash of every input that affects the tailored content (job id excluded)"""
+        parts = [
+            base_resume.model_dump_json(),
+            user_profile.model_dump_json(
+                include={'id', 'skills', 'years_of_experience', 'experience_level'}
+            ),
+            job.title,
+            job.company or "",
+            job.description or "",
+            "\x1f".join(job.skills)
+        ]
+        return hashlib.sha256("\x00".join(parts).encode()).hexdigest()
+    
     def _extract_job_keywords(self, job: Job) -> List[str]:
         """Extract important keywords from job description"""
-        keywords = set()
+        # Insertion-ordered set: title words, then skills, then description
+        # keywords, so the top-50 cut is deterministic
+        keywords: Dict[str, None] = {}
         
         # Add job title keywords
         title_words = job.title.lower().split()
-        keywords.update(w for w in title_words if len(w) > 3)
+        keywords.update(dict.fromkeys(w for w in title_words if len(w) > 3))
         
         # Add skills
-        keywords.update(s.lower() for s in job.skills)
+        keywords.update(dict.fromkeys(s.lower() for s in job.skills))
         
         # Extract from description using common patterns
-        description = job.description.lower() if job.description else ""
+        # ("experience with X", "proficient in X"); cached per description,
+        # and skipped once the cap is already reached
+        if len(keywords) < 50 and job.description:
+            keywords.update(dict.fromkeys(_description_keywords(job.description.lower())))
         
-        # Pattern: "experience with X"
-        experience_pattern = r'experience\s+(?:with|in|using)\s+([a-z][a-z0-9\s\.\+#-]+)'
-        for match in re.finditer(experience_pattern, description):
-            keyword = match.group(1).strip().split()[0]  # First word
-            if len(keyword) > 2:
-                keywords.add(keyword)
-        
-        # Pattern: "proficient in X"
-        proficient_pattern = r'(?:proficient|expert|skilled)\s+(?:in|with)\s+([a-z][a-z0-9\s\.\+#-]+)'
-        for match in re.finditer(proficient_pattern, description):
-            keyword = match.group(1).strip().split()[0]
-            if len(keyword) > 2:
-                keywords.add(keyword)
-        
-        return list(keywords)[:50]  # Top 50 keywords
+        return list(islice(keywords, 50))  # Top 50 keywords
     
     def _tailor_summary(
         self,
         base_summary: str,
         job: Job,
         user_profile: UserProfile,
-        job_keywords: List[str]
+        job_keywords: List[str],
+        required_skills: set,
+        user_skills_lower: List[str]
     ) -> str:
         """
         Tailor the professional summary for the job
+        
+        required_skills and user_skills_lower are the lowercased job and
+        user skills.
         """
         # Extract key info
         years_exp = user_profile.years_of_experience or 3
@@ -144,10 +299,11 @@ class ResumeTailoringService:
         top_skills = user_profile.skills[:5]
         
         # Get top 3 job skills that match user skills
-        user_skills_lower = set(s.lower() for s in user_profile.skills)
+        user_skills_set = set(user_skills_lower)
         matched_job_skills = []
         for skill in job.skills[:5]:  # Top 5 job skills
-            if skill.lower() in user_skills_lower or any(us.lower() in skill.lower() for us in user_profile.skills):
+            skill_lower = skill.lower()
+            if skill_lower in user_skills_set or any(us in skill_lower for us in user_skills_lower):
                 matched_job_skills.append(skill)
         
         # If no direct matches, use job skills anyway (important for ATS)
@@ -204,12 +360,11 @@ class ResumeTailoringService:
         
         tailored_summary = " ".join(summary_parts) + "."
 
-        required_skills = set(s.lower() for s in job.skills)
         tailored_summary = self._inject_soft_skills_into_summary(
             tailored_summary,
             job,
             required_skills,
-            user_profile.skills
+            user_skills_set
         )
         
         return tailored_summary
@@ -222,34 +377,21 @@ class ResumeTailoringService:
     ) -> List[WorkExperience]:
         """Select and optimize most relevant work experience"""
         
-        scored_experience = []
-        
-        for exp in all_experience:
-            # Score based on relevance
-            score = 0
-            
+        def score(exp: WorkExperience) -> int:
             # Technology overlap
-            exp_tech = set(t.lower() for t in exp.technologies)
-            tech_overlap = len(exp_tech.intersection(required_skills))
-            score += tech_overlap * 10
+            tech_overlap = len(required_skills.intersection(t.lower() for t in exp.technologies))
             
             # Description keyword matches
             desc_lower = exp.description.lower()
-            for skill in required_skills:
-                if skill in desc_lower:
-                    score += 5
+            desc_hits = sum(skill in desc_lower for skill in required_skills)
             
             # Recent experience gets higher score
-            if exp.end_date is None or exp.end_date.lower() == "present":
-                score += 20
+            is_current = exp.end_date is None or exp.end_date.lower() == "present"
             
-            scored_experience.append((score, exp))
-        
-        # Sort by score and take top experiences
-        scored_experience.sort(key=lambda x: x[0], reverse=True)
+            return tech_overlap * 10 + desc_hits * 5 + is_current * 20
         
-        # Return top 3-4 most relevant
-        return [exp for _, exp in scored_experience[:4]]
+        # Return top 3-4 most relevant (same order as a stable descending sort)
+        return heapq.nlargest(4, all_experience, key=score)
     
     def _select_relevant_projects(
         self,
@@ -259,28 +401,21 @@ class ResumeTailoringService:
     ) -> List[Project]:
         """Select most relevant projects"""
         
-        scored_projects = []
+        # Job title words worth matching, computed once for all projects
+        job_title_words = [word for word in set(job.title.lower().split()) if len(word) > 3]
         
-        for project in all_projects:
-            score = 0
-            
+        def score(project: Project) -> int:
             # Technology match
-            proj_tech = set(t.lower() for t in project.technologies)
-            tech_overlap = len(proj_tech.intersection(required_skills))
-            score += tech_overlap * 15
+            tech_overlap = len(required_skills.intersection(t.lower() for t in project.technologies))
             
             # Description keywords
             desc_lower = project.description.lower()
-            job_title_words = set(job.title.lower().split())
-            for word in job_title_words:
-                if len(word) > 3 and word in desc_lower:
-                    score += 5
+            title_hits = sum(word in desc_lower for word in job_title_words)
             
-            scored_projects.append((score, project))
+            return tech_overlap * 15 + title_hits * 5
         
-        # Sort and return top 2-3
-        scored_projects.sort(key=lambda x: x[0], reverse=True)
-        return [proj for _, proj in scored_projects[:3]]
+        # Return top 2-3
+        return heapq.nlargest(3, all_projects, key=score)
     
     def _highlight_skills(
         self,
@@ -290,28 +425,22 @@ class ResumeTailoringService:
     ) -> List[str]:
         """Select and order skills to highlight"""
         
-        highlighted = []
-        all_user_skills = []
-        
-        # Flatten all skills
-        for category, skills in all_skills.items():
-            all_user_skills.extend(skills)
-        
-        # First: Add matching required skills
-        for skill in all_user_skills:
-            if skill.lower() in required_skills:
-                highlighted.append(skill)
-        
-        # Second: Add skills matching job keywords
-        for skill in all_user_skills:
-            skill_lower = skill.lower()
-            if skill not in highlighted and any(kw in skill_lower for kw in job_keywords):
-                highlighted.append(skill)
-        
-        # Third: Add remaining important skills
-        for skill in all_user_skills:
-            if skill not in highlighted and len(highlighted) < 15:
-                highlighted.append(skill)
+        # One pass sorts each skill into a tier: 0 = required by the job,
+        # 1 = matches a job keyword, 2 = everything else
+        tiers: Tuple[List[str], List[str], List[str]] = ([], [], [])
+        for skills in all_skills.values():
+            for skill in skills:
+                skill_lower = skill.lower()
+                if skill_lower in required_skills:
+                    tiers[0].append(skill)
+                elif any(kw in skill_lower for kw in job_keywords):
+                    tiers[1].append(skill)
+                else:
+                    tiers[2].append(skill)
+        
+        # Equal skills always land in the same tier, so deduplicating within
+        # the lower tiers is enough
+        highlighted = tiers[0] + list(dict.fromkeys(tiers[1])) + list(dict.fromkeys(tiers[2]))
         
         return highlighted[:15]  # Max 15 skills
     
@@ -320,25 +449,29 @@ class ResumeTailoringService:
         summary: str,
         experience: List[WorkExperience],
         projects: List[Project],
-        job_keywords: List[str]
+        job_keywords: List[str],
+        keyword_matcher: Optional[KeywordMatcher] = None
     ) -> List[str]:
-        """Identify which job keywords are included in the tailored resume"""
-        
-        # Combine all text
-        all_text = summary.lower()
-        for exp in experience:
-            all_text += " " + exp.description.lower()
-            all_text += " " + " ".join(exp.achievements).lower()
-        for proj in projects:
-            all_text += " " + proj.description.lower()
+        """
+        Identify which job keywords are included in the tailored resume
         
-        # Check which keywords are present
-        included = []
-        for keyword in job_keywords:
-            if keyword.lower() in all_text:
-                included.append(keyword)
+        keyword_matcher, if given, must cover job_keywords (batch callers
+        share one across jobs); otherwise one is built for job_keywords.
+        """
         
-        return included
+        # Combine all text in one join, lowercased once as a whole
+        parts = [summary]
+        for exp in experience:
+            parts.append(exp.description)
+            parts.append(" ".join(exp.achievements))
+        parts.extend(proj.description for proj in projects)
+        all_text = " ".join(parts).lower()
+        
+        # Check which keywords are present, in one scan of the text
+        if keyword_matcher is None:
+            keyword_matcher = KeywordMatcher(job_keywords)
+        found = keyword_matcher.find_in(all_text, lowered=True)
+        return [keyword for keyword in job_keywords if keyword.lower() in found]
     
     def _generate_strategy(self, job: Job, required_skills: set) -> str:
         """Generate a description of the tailoring strategy used"""
@@ -371,12 +504,19 @@ class ResumeTailoringService:
         Returns:
             ATS optimization analysis
         """
-        job_keywords = set(s.lower() for s in job.skills)
-        resume_keywords = set(s.lower() for s in tailored_resume.keywords_included)
+        # Job keywords deduplicated in posting order, so matched/missing lists
+        # (and the truncated suggestions) come out in a stable order
+        job_keywords = dict.fromkeys(s.lower() for s in job.skills)
+        resume_keywords = {s.lower() for s in tailored_resume.keywords_included}
+        
+        # Split job keywords into matched/missing in one pass
+        matched: List[str] = []
+        missing: List[str] = []
+        for keyword in job_keywords:
+            (matched if keyword in resume_keywords else missing).append(keyword)
         
         # Calculate match rate
         if job_keywords:
-            matched = job_keywords.intersection(resume_keywords)
             match_rate = len(matched) / len(job_keywords)
         else:
             match_rate = 0.5
@@ -387,21 +527,18 @@ class ResumeTailoringService:
         # Boost for good formatting (assuming good format)
         ats_score = min(100, ats_score + 10)
         
-        # Identify missing keywords
-        missing = job_keywords - resume_keywords
-        
         # Generate suggestions
         suggestions = []
         if match_rate < 0.7:
-            suggestions.append(f"Add these missing keywords: {', '.join(list(missing)[:5])}")
+            suggestions.append(f"Add these missing keywords: {', '.join(missing[:5])}")
         if len(tailored_resume.tailored_summary.split()) < 50:
             suggestions.append("Consider expanding your professional summary")
         
         return ATSOptimizationResult(
             ats_score=ats_score,
             keyword_match_rate=match_rate,
-            matched_keywords=list(matched) if job_keywords else [],
-            missing_keywords=list(missing)[:10],
+            matched_keywords=matched,
+            missing_keywords=missing[:10],
             suggestions=suggestions
         )
     
@@ -410,7 +547,7 @@ class ResumeTailoringService:
         base_summary: str,
         job: Job,
         required_skills: set,
-        user_skills: List[str]
+        user_skills_lower: set
     ) -> str:
         """
         Inject soft skills into the summary if they're required by the job
@@ -419,40 +556,21 @@ class ResumeTailoringService:
             base_summary: Base summary text
             job: Job posting
             required_skills: Required skills from job
-            user_skills: All user skills (including soft skills)
+            user_skills_lower: All user skills (including soft skills), lowercased
             
         Returns:
             Summary with soft skills incorporated
         """
-        # Common soft skills to look for
-        soft_skill_keywords = {
-            'leadership': ['leadership', 'lead', 'mentor', 'mentoring', 'team lead'],
-            'communication': ['communication', 'collaborate', 'collaboration', 'stakeholder'],
-            'architecture': ['architecture', 'system design', 'design', 'architect'],
-            'agile': ['agile', 'scrum', 'sprint']
-        }
-        
-        # Flatten user skills for checking
-        user_skills_lower = set(s.lower() for s in user_skills)
+        # One scan of the required skills finds every soft-skill keyword the job mentions
+        required_found = SOFT_SKILL_MATCHER.find_in(' '.join(required_skills))
         
         # Check which soft skills are required and user has
-        soft_skills_to_add = []
-        for skill_category, keywords in soft_skill_keywords.items():
-            # Check if job requires this skill
-            job_requires = any(kw in ' '.join(required_skills).lower() for kw in keywords)
-            # Check if user has this skill
-            user_has = any(kw in user_skills_lower for kw in keywords)
-            
-            if job_requires and user_has:
-                # Add the most appropriate term
-                if 'leadership' in keywords and user_has:
-                    soft_skills_to_add.append('leadership')
-                elif 'communication' in keywords and user_has:
-                    soft_skills_to_add.append('strong communication')
-                elif 'architecture' in keywords and user_has:
-                    soft_skills_to_add.append('system architecture')
-                elif 'agile' in keywords and user_has:
-                    soft_skills_to_add.append('Agile methodologies')
+        soft_skills_to_add = [
+            phrase
+            for keywords, phrase in SOFT_SKILLS.values()
+            if not required_found.isdisjoint(keywords)
+            and not user_skills_lower.isdisjoint(keywords)
+        ]
         
         # Inject soft skills into summary
         if soft_skills_to_add:
@@ -1,5 +1,7 @@
 # services/scoring_engine.py
-from typing import Dict, Optional
+from typing import Dict, List, Optional
+import re
+import numpy as np
 from services.embeddings import EmbeddingService  # Changed from embedding_service
 from models.scoring import ScoringWeights, ScoringConfig
 from models.user_profile import UserProfile
@@ -8,6 +10,14 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Job-title words that mark seniority, matched as whole words
+SENIOR_TITLE_WORDS = frozenset({'senior', 'sr', 'lead', 'principal', 'staff'})
+JUNIOR_TITLE_WORDS = frozenset({'junior', 'jr', 'entry', 'associate'})
+TITLE_WORD_PATTERN = re.compile(r'[a-z]+')
+
+# Title seniority levels, in the order of the success-score lookup table
+SENIORITY_LEVELS = ('junior', 'mid', 'senior')
+
 class ScoringEngine:
     """Calculate job scores based on multiple factors."""
     
@@ -20,10 +30,69 @@ class ScoringEngine:
         self.config = config or ScoringConfig()
         self.config.weights.validate_weights()
     
+    async def score_jobs(
+        self,
+        jobs: List[Job],
+        user_profile: UserProfile
+    ) -> List['JobScore']:
+        """
+        Score many jobs for one profile.
+        
+        The profile and all job descriptions are embedded in a single
+        encode call, and every job's similarity to the profile comes from
+        one matrix-vector product instead of one model call per job.
+        
+        Args:
+            jobs: Job objects
+            user_profile: UserProfile object
+            
+        Returns:
+            JobScore objects for the jobs that scored successfully
+        """
+        similarities: List[Optional[float]] = [None] * len(jobs)
+        
+        described = [i for i, job in enumerate(jobs) if job.description]
+        if described:
+            try:
+                embeddings = self.embedding_service.encode(
+                    [self._user_skill_text(user_profile)] +
+                    [self._job_skill_text(jobs[i]) for i in described]
+                )
+                # Unit-length rows: dot products are the cosine similarities
+                for i, similarity in zip(described, (embeddings[1:] @ embeddings[0]).tolist()):
+                    similarities[i] = similarity
+            except Exception as e:
+                logger.warning(f"Batch embedding failed, embedding per job: {e}")
+        
+        # Salary and success scores for all jobs at once
+        salary_scores = self._score_salaries(jobs, user_profile)
+        success_scores = self._score_success_probabilities(jobs, user_profile)
+        
+        scores = []
+        for i, (job, similarity) in enumerate(zip(jobs, similarities)):
+            try:
+                score = self._build_score(
+                    job,
+                    user_profile,
+                    await self._score_skills(job, user_profile, similarity),
+                    float(salary_scores[i]),
+                    self._score_location(job, user_profile),
+                    self._score_company(job, user_profile),
+                    float(success_scores[i])
+                )
+                scores.append(score)
+                logger.debug(f"Scored job {job.id}: {score.overall_score:.2f}")
+            except Exception as e:
+                logger.error(f"Error scoring job {job.id}: {e}")
+                continue
+        
+        return scores
+    
     async def score_job(
         self,
         job: Job,
-        user_profile: UserProfile
+        user_profile: UserProfile,
+        similarity: Optional[float] = None
     ) -> 'JobScore':
         """
         Calculate comprehensive score for a job.
@@ -31,18 +100,34 @@ class ScoringEngine:
         Args:
             job: Job object
             user_profile: UserProfile object
+            similarity: Precomputed profile/job embedding similarity, e.g. from score_jobs
             
         Returns:
             JobScore object
         """
-        from models.scoring import JobScore
-        
         # Component scores (all 0-100)
-        skill_score = await self._score_skills(job, user_profile)
-        salary_score = self._score_salary(job, user_profile)
-        location_score = self._score_location(job, user_profile)
-        company_score = self._score_company(job, user_profile)
-        success_score = self._score_success_probability(job, user_profile)
+        return self._build_score(
+            job,
+            user_profile,
+            await self._score_skills(job, user_profile, similarity),
+            self._score_salary(job, user_profile),
+            self._score_location(job, user_profile),
+            self._score_company(job, user_profile),
+            self._score_success_probability(job, user_profile)
+        )
+    
+    def _build_score(
+        self,
+        job: Job,
+        user_profile: UserProfile,
+        skill_score: float,
+        salary_score: float,
+        location_score: float,
+        company_score: float,
+        success_score: float
+    ) -> 'JobScore':
+        """Combine component scores (all 0-100) into a JobScore."""
+        from models.scoring import JobScore
         
         # Calculate weighted total
         weights = self.config.weights
@@ -73,7 +158,20 @@ class ScoringEngine:
             job=job
         )
     
-    async def _score_skills(self, job: Job, user_profile: UserProfile) -> float:
+    def _user_skill_text(self, user_profile: UserProfile) -> str:
+        """Text embedded for the profile side of semantic skill matching."""
+        return ", ".join(user_profile.skills or [])
+    
+    def _job_skill_text(self, job: Job) -> str:
+        """Text embedded for the job side of semantic skill matching."""
+        return f"{job.title}. {job.description[:500]}"
+    
+    async def _score_skills(
+        self,
+        job: Job,
+        user_profile: UserProfile,
+        similarity: Optional[float] = None
+    ) -> float:
         """Score skill match (0-100)."""
         user_skills = user_profile.skills or []
         job_skills = job.skills or []
@@ -94,14 +192,15 @@ class ScoringEngine:
         # Semantic similarity using embeddings
         if job.description:
             try:
-                user_text = ", ".join(user_skills)
-                job_text = f"{job.title}. {job.description[:500]}"
-                
-                # Use the correct method based on your EmbeddingService
-                embeddings = self.embedding_service.encode([user_text, job_text])
-                similarity = self.embedding_service.cosine_similarity(
-                    embeddings[0], embeddings[1]
-                )
+                if similarity is None:
+                    embeddings = self.embedding_service.encode([
+                        self._user_skill_text(user_profile),
+                        self._job_skill_text(job)
+                    ])
+                    # encode() returns unit-length vectors
+                    similarity = self.embedding_service.cosine_similarity(
+                        embeddings[0], embeddings[1], normalized=True
+                    )
                 
                 semantic_score = max(0, min(100, similarity * 100))
                 
@@ -153,6 +252,38 @@ class ScoringEngine:
             else:
                 return 10.0  # Far below
     
+    def _score_salaries(self, jobs: List[Job], user_profile: UserProfile) -> np.ndarray:
+        """_score_salary for many jobs at once (same rules, as array operations)."""
+        user_min = user_profile.target_salary_min
+        user_max = user_profile.target_salary_max
+        
+        if not user_min:
+            return np.full(len(jobs), 50.0)
+        
+        has_min = np.array([bool(job.salary_min) for job in jobs], dtype=bool)
+        job_min = np.array([job.salary_min or 0 for job in jobs], dtype=np.float64)
+        job_max = np.array([job.salary_max or 0 for job in jobs], dtype=np.float64)
+        
+        meets_min = job_min >= user_min
+        if user_max:
+            in_range = (job_max != 0) & (job_max <= user_max * 1.2)
+        else:
+            in_range = np.zeros(len(jobs), dtype=bool)
+        gap_percentage = ((user_min - job_min) / user_min) * 100
+        
+        return np.select(
+            [
+                ~has_min,  # No salary data
+                meets_min & (in_range | (job_min >= user_min * 1.5)),
+                meets_min,
+                gap_percentage < 10,
+                gap_percentage < 20,
+                gap_percentage < 30
+            ],
+            [50.0, 100.0, 80.0, 60.0, 40.0, 20.0],
+            default=10.0
+        )
+    
     def _score_location(self, job: Job, user_profile: UserProfile) -> float:
         """Score location match (0-100)."""
         job_location = (job.location or '').lower()
@@ -217,17 +348,42 @@ class ScoringEngine:
     
     def _score_success_probability(self, job: Job, user_profile: UserProfile) -> float:
         """Score likelihood of success (0-100)."""
-        user_experience = user_profile.years_of_experience or 0
+        return self._success_score(
+            (user_profile.experience_level or 'mid').lower(),
+            user_profile.years_of_experience or 0,
+            self._title_seniority(job.title)
+        )
+    
+    def _score_success_probabilities(self, jobs: List[Job], user_profile: UserProfile) -> np.ndarray:
+        """_score_success_probability for many jobs at once."""
         user_level = (user_profile.experience_level or 'mid').lower()
-        job_title = job.title.lower()
-        
-        # Parse seniority from title
-        title_seniority = 'mid'  # default
-        if any(word in job_title for word in ['senior', 'sr', 'lead', 'principal', 'staff']):
-            title_seniority = 'senior'
-        elif any(word in job_title for word in ['junior', 'jr', 'entry', 'associate']):
-            title_seniority = 'junior'
+        user_experience = user_profile.years_of_experience or 0
         
+        # The score only depends on the title's seniority: score each level
+        # once and index the table by every job's level
+        table = np.array([
+            self._success_score(user_level, user_experience, seniority)
+            for seniority in SENIORITY_LEVELS
+        ])
+        levels = np.fromiter(
+            (SENIORITY_LEVELS.index(self._title_seniority(job.title)) for job in jobs),
+            dtype=np.intp,
+            count=len(jobs)
+        )
+        return table[levels]
+    
+    def _title_seniority(self, title: str) -> str:
+        """Seniority level ('junior', 'mid' or 'senior') implied by a job title."""
+        # Whole words: "sr." counts, "leadership" doesn't
+        title_words = set(TITLE_WORD_PATTERN.findall(title.lower()))
+        if not SENIOR_TITLE_WORDS.isdisjoint(title_words):
+            return 'senior'
+        if not JUNIOR_TITLE_WORDS.isdisjoint(title_words):
+            return 'junior'
+        return 'mid'
+    
+    def _success_score(self, user_level: str, user_experience: int, title_seniority: str) -> float:
+        """Success score for a user level/experience applying to a title seniority."""
         # Match experience level
         if user_level == title_seniority:
             base_score = 80.0
@@ -1,6 +1,7 @@
 # services/skill_matcher.py
 from typing import List, Dict, Tuple
 from services.embeddings import EmbeddingService
+import numpy as np
 import logging
 
 logger = logging.getLogger(__name__)
@@ -45,9 +46,12 @@ class SkillMatcher:
                 'skill_details': []
             }
         
-        # Generate embeddings for all skills
-        user_embeddings = self.embedding_service.generate_embeddings(user_skills)
-        job_embeddings = self.embedding_service.generate_embeddings(job_skills)
+        # Generate (unit-length) embeddings for all skills
+        user_embeddings = self.embedding_service.encode(user_skills)
+        job_embeddings = self.embedding_service.encode(job_skills)
+        
+        # Cosine similarity of every (job skill, user skill) pair, clamped to [0, 1]
+        similarities = np.clip(job_embeddings @ user_embeddings.T, 0.0, 1.0)
         
         matched_skills = []
         missing_skills = []
@@ -55,19 +59,9 @@ class SkillMatcher:
         
         # For each job skill, find best matching user skill
         for job_idx, job_skill in enumerate(job_skills):
-            job_emb = job_embeddings[job_idx]
-            
-            # Find most similar user skill
-            best_similarity = 0.0
-            best_user_skill = None
-            
-            for user_idx, user_skill in enumerate(user_skills):
-                user_emb = user_embeddings[user_idx]
-                similarity = self.embedding_service.compute_similarity(user_emb, job_emb)
-                
-                if similarity > best_similarity:
-                    best_similarity = similarity
-                    best_user_skill = user_skill
+            best_idx = int(similarities[job_idx].argmax())
+            best_similarity = float(similarities[job_idx, best_idx])
+            best_user_skill = user_skills[best_idx] if best_similarity > 0.0 else None
             
             # Record the match
             skill_detail = {
@@ -112,9 +106,12 @@ class SkillMatcher:
         profile_text = self.embedding_service.embed_user_profile(user_profile)
         job_text = self.embedding_service.embed_job_description(job_data)
         
+        # Nothing to compare (legacy embeddings of empty text were all zeros)
+        if not profile_text or not job_text:
+            return 0.0
+        
         # Generate embeddings
-        profile_emb = self.embedding_service.generate_embedding(profile_text)
-        job_emb = self.embedding_service.generate_embedding(job_text)
+        profile_emb, job_emb = self.embedding_service.encode([profile_text, job_text])
         
         # Compute similarity
         similarity = self.embedding_service.compute_similarity(profile_emb, job_emb)
@@ -11,6 +11,7 @@ from services.pdf_generator import PDFGenerator
 async def check_schema_and_generate():
     db = Database()
     await db.connect()
+    resume_service = None
     
     try:
         # First, check the jobs table schema
@@ -118,6 +119,8 @@ async def check_schema_and_generate():
         traceback.print_exc()
         
     finally:
+        if resume_service is not None:
+            resume_service.close()
         await db.disconnect()
 
 if __name__ == "__main__":
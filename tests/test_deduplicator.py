@@ -0,0 +1,131 @@
+import os
+import time
+import pytest
+from datetime import datetime, timedelta
+import services.deduplicator as deduplicator_module
+from services.deduplicator import JobDeduplicator, SOFT_DUPLICATE_CANDIDATES_SQL, scrape_watermark
+from models.job import RawJob
+
+
+class FakeConnection:
+    """Returns canned rows for SOFT_DUPLICATE_CANDIDATES_SQL."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    async def fetch(self, query, *args):
+        self.queries.append((query, args))
+        return self.rows
+
+
+class ScrapedAtConnection(FakeConnection):
+    """Computes is_new from scraped_at like SOFT_DUPLICATE_CANDIDATES_SQL does."""
+
+    async def fetch(self, query, *args):
+        self.queries.append((query, args))
+        since = args[0]
+        return [
+            {**row, 'is_new': row['scraped_at'] >= since}
+            for row in self.rows
+            if row['scraped_at'] > since - timedelta(days=7)
+        ]
+
+
+class FakePool:
+    """Minimal stand-in for the asyncpg pool / Database wrapper."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def acquire(self):
+        pool = self
+
+        class Acquire:
+            async def __aenter__(self):
+                return pool.conn
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return Acquire()
+
+
+def candidate(job_id, title, is_new, company="techcorp", platform="jsearch"):
+    return {
+        'id': job_id,
+        'platform': platform,
+        'company_norm': company,
+        'title_norm': title,
+        'is_new': is_new
+    }
+
+
+ROWS = [
+    candidate('old-1', 'senior python developer', False),
+    candidate('old-2', 'data analyst', False),
+    candidate('new-1', 'senior python developer ', True),   # repost of old-1
+    candidate('new-2', 'machine learning engineer', True),  # nothing similar
+    candidate('new-3', 'machine learning engineers', True), # repost of new-2
+    candidate('new-4', 'senior python developer', True, company='othercorp'),
+]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("use_rapidfuzz", [True, False])
+async def test_find_soft_duplicates_bulk(monkeypatch, use_rapidfuzz):
+    """New postings match earlier ones from the same company only."""
+    if not use_rapidfuzz:
+        monkeypatch.setattr(deduplicator_module, "process", None)
+
+    conn = FakeConnection(ROWS)
+    deduplicator = JobDeduplicator(FakePool(conn))
+    since = datetime(2026, 1, 1)
+
+    duplicates = await deduplicator.find_soft_duplicates_bulk(since)
+
+    assert conn.queries == [(SOFT_DUPLICATE_CANDIDATES_SQL, (since,))]
+    assert sorted(duplicates) == [('new-1', 'old-1'), ('new-3', 'new-2')]
+
+
+@pytest.mark.asyncio
+async def test_find_soft_duplicates_bulk_no_candidates():
+    """No recent postings, no duplicates."""
+    deduplicator = JobDeduplicator(FakePool(FakeConnection([])))
+
+    assert await deduplicator.find_soft_duplicates_bulk(datetime(2026, 1, 1)) == []
+
+
+@pytest.fixture
+def non_utc_timezone():
+    """Run the test with a local timezone east of UTC."""
+    previous = os.environ.get('TZ')
+    os.environ['TZ'] = 'Asia/Kolkata'
+    time.tzset()
+    yield
+    if previous is None:
+        del os.environ['TZ']
+    else:
+        os.environ['TZ'] = previous
+    time.tzset()
+
+
+@pytest.mark.asyncio
+async def test_scrape_watermark_matches_scraped_at_clock(non_utc_timezone):
+    """Jobs scraped after the watermark count as new outside UTC too."""
+    assert datetime.now() - datetime.utcnow() > timedelta(hours=5)
+
+    old_job = RawJob(platform="jsearch", url="https://example.com/1", raw_data={})
+    old_job.scraped_at -= timedelta(days=1)
+    watermark = scrape_watermark()
+    new_job = RawJob(platform="jsearch", url="https://example.com/2", raw_data={})
+
+    assert old_job.scraped_at < watermark <= new_job.scraped_at
+
+    rows = [
+        {**candidate('old-1', 'senior python developer', None), 'scraped_at': old_job.scraped_at},
+        {**candidate('new-1', 'senior python developer', None), 'scraped_at': new_job.scraped_at},
+    ]
+    deduplicator = JobDeduplicator(FakePool(ScrapedAtConnection(rows)))
+
+    assert await deduplicator.find_soft_duplicates_bulk(watermark) == [('new-1', 'old-1')]
@@ -0,0 +1,143 @@
+import hashlib
+import numpy as np
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("sentence_transformers")
+
+import services.embeddings as embeddings_module
+from services.embeddings import EmbeddingService, JobEmbeddingStore
+
+DIM = 16
+
+
+class FakeModel:
+    """Deterministic stand-in for SentenceTransformer that counts encoded texts."""
+
+    def __init__(self, model_name, **kwargs):
+        self.encoded = []
+
+    def eval(self):
+        return self
+
+    def get_sentence_embedding_dimension(self):
+        return DIM
+
+    def encode(self, texts, normalize_embeddings=False, **kwargs):
+        self.encoded.extend(texts)
+        vectors = np.stack([
+            np.random.default_rng(int(hashlib.md5(text.encode()).hexdigest()[:8], 16))
+            .normal(size=DIM).astype(np.float32)
+            for text in texts
+        ])
+        if normalize_embeddings:
+            vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(embeddings_module, "SentenceTransformer", FakeModel)
+    service = EmbeddingService(device="cpu")
+    service.model.encoded.clear()  # drop the warmup call
+    return service
+
+
+def reference_similarities(query, candidates):
+    """Plain NumPy cosine similarity; 0 where either vector is zero."""
+    query = np.asarray(query, dtype=np.float64)
+    candidates = np.asarray(candidates, dtype=np.float64)
+    norms = np.linalg.norm(candidates, axis=1) * np.linalg.norm(query)
+    dots = candidates @ query
+    return np.divide(dots, norms, out=np.zeros_like(dots), where=norms > 0)
+
+
+def test_encode_cache_hit_skips_model(service):
+    first = service.encode(["python developer", "data analyst"])
+    second = service.encode(["data analyst", "python developer", "data analyst"])
+
+    assert service.model.encoded == ["python developer", "data analyst"]
+    np.testing.assert_array_equal(second, first[[1, 0, 1]])
+
+
+def test_encode_cache_key_includes_normalize(service):
+    normalized = service.encode("python developer")
+    raw = service.encode("python developer", normalize=False)
+
+    assert service.model.encoded == ["python developer", "python developer"]
+    assert service._cache_key("python developer", True) != service._cache_key("python developer", False)
+    np.testing.assert_allclose(normalized[0], raw[0] / np.linalg.norm(raw[0]), rtol=1e-6)
+
+
+def test_encode_cache_evicts_least_recently_used(service):
+    service.cache_size = 2
+    service.encode(["a", "b"])
+    service.encode("a")          # "a" is now the most recently used
+    service.encode("c")          # evicts "b"
+    service.model.encoded.clear()
+
+    service.encode(["a", "c", "b"])
+
+    assert service.model.encoded == ["b"]
+    assert len(service._cache) == 2
+
+
+def test_cosine_similarity_matches_numpy(service):
+    rng = np.random.default_rng(0)
+    a, b = rng.normal(size=(2, DIM)).astype(np.float32)
+    zero = np.zeros(DIM, dtype=np.float32)
+
+    assert service.cosine_similarity(a, b) == pytest.approx(reference_similarities(a, [b])[0], abs=1e-5)
+    assert service.cosine_similarity(a, zero) == 0.0
+    assert service.cosine_similarity(zero, zero) == 0.0
+
+    unit_a, unit_b = a / np.linalg.norm(a), b / np.linalg.norm(b)
+    assert service.cosine_similarity(unit_a, unit_b, normalized=True) == pytest.approx(
+        float(np.dot(unit_a, unit_b)), abs=1e-5
+    )
+
+
+@pytest.mark.parametrize("path", ["simsimd", "numpy", "float16"])
+def test_find_best_matches_matches_numpy(service, monkeypatch, path):
+    rng = np.random.default_rng(1)
+    query = rng.normal(size=DIM).astype(np.float32)
+    candidates = rng.normal(size=(50, DIM)).astype(np.float32)
+    candidates[7] = 0.0  # zero vectors score 0, not 1
+    if path == "simsimd" and embeddings_module.simsimd is None:
+        pytest.skip("simsimd not installed")
+    if path == "numpy":
+        monkeypatch.setattr(embeddings_module, "simsimd", None)
+    if path == "float16":
+        candidates = candidates.astype(np.float16)
+
+    expected = reference_similarities(query, candidates)
+    matches = service.find_best_matches(query, candidates, top_k=len(candidates))
+    tolerance = 2e-3 if path == "float16" else 1e-5
+
+    assert sorted(match['index'] for match in matches) == list(range(len(candidates)))
+    for match in matches:
+        assert match['similarity'] == pytest.approx(expected[match['index']], abs=tolerance)
+    assert matches[0]['index'] == int(np.argmax(expected))
+
+    assert service.find_best_matches(np.zeros(DIM), candidates, top_k=3)[0]['similarity'] == 0.0
+
+
+@pytest.mark.parametrize("on_disk", [False, True])
+def test_job_embedding_store_query_and_grow(service, tmp_path, on_disk):
+    store = JobEmbeddingStore(
+        service, initial_capacity=2, path=tmp_path / "jobs.f16" if on_disk else None
+    )
+    texts = {f"job-{i}": f"posting number {i}" for i in range(5)}
+    store.upsert_many(list(texts.items()))
+    store.upsert("job-1", "posting number 1")  # replace, not append
+
+    assert store.ids == list(texts)
+    assert store.matrix.shape == (5, DIM)
+
+    matches = store.query("posting number 3", top_k=2)
+
+    assert matches[0]['job_id'] == "job-3"
+    assert matches[0]['similarity'] == pytest.approx(1.0, abs=2e-3)
+    np.testing.assert_allclose(
+        store.vector("job-3"), service.encode("posting number 3")[0], atol=2e-3
+    )
@@ -0,0 +1,71 @@
+import pytest
+from models.generated_resume import TailoredResumeData
+from services.pdf_generator import PDFGenerator, KEYWORD_WEIGHT, FORMATTING_WEIGHT
+
+
+RESUME = TailoredResumeData(
+    contact_info={'name': 'Test User', 'email': 'test@example.com', 'phone': '555-0100'},
+    professional_summary="Python engineer with AWS and SQL experience",
+    experience=[{
+        'title': 'Developer',
+        'company': 'TechCorp',
+        'start_date': '2020',
+        'end_date': '2022',
+        'responsibilities': ['Built python APIs', 'Ran Docker on AWS']
+    }],
+    education=[{'degree': 'BSc', 'institution': 'State University'}],
+    skills=['Python', 'SQL', 'Docker'],
+    projects=[{'name': 'Scheduler', 'description': 'Kubernetes tool', 'highlights': ['fast']}]
+)
+
+
+def reference_ats_score(generator, resume_data, job_keywords):
+    """The per-keyword computation calculate_ats_score used to do inline."""
+    resume_text = generator._extract_all_text(resume_data).lower()
+    matched = [kw for kw in job_keywords if kw.lower() in resume_text]
+    missing = [kw for kw in job_keywords if kw.lower() not in resume_text]
+    keyword_match_rate = (len(matched) / len(job_keywords) * 100) if job_keywords else 0
+    formatting_score = generator._calculate_formatting_score(resume_data)
+    overall_score = (keyword_match_rate * 0.7) + (formatting_score * 0.3)
+    return matched, missing, keyword_match_rate, overall_score
+
+
+@pytest.mark.parametrize("job_keywords", [
+    ["python", "AWS", "kubernetes", "go", "Rust", "sql", "c++", "Docker"],
+    ["Python", "python", "PYTHON"],
+    ["java", "scala"],
+    [],
+])
+def test_calculate_ats_score_matches_reference(tmp_path, job_keywords):
+    generator = PDFGenerator(tmp_path)
+    matched, missing, keyword_match_rate, overall_score = reference_ats_score(
+        generator, RESUME, job_keywords
+    )
+
+    scores = generator.calculate_ats_score(RESUME, job_keywords)
+
+    assert scores.matched_keywords == matched
+    assert scores.missing_keywords == missing
+    assert scores.keyword_match_rate == round(keyword_match_rate, 2)
+    assert scores.overall_score == round(overall_score, 2)
+
+    # Precomputed search text gives the same result
+    resume_text = generator.search_text(RESUME)
+    assert generator.calculate_ats_score(RESUME, job_keywords, resume_text) == scores
+
+
+@pytest.mark.parametrize("matched_count,total_keywords,formatting_score", [
+    (0, 0, 100.0),
+    (0, 5, 80.0),
+    (3, 8, 90.0),
+    (7, 7, 0.0),
+])
+def test_aggregate_ats_score(matched_count, total_keywords, formatting_score):
+    keyword_match_rate, overall_score = PDFGenerator._aggregate_ats_score(
+        matched_count, total_keywords, formatting_score
+    )
+    expected_rate = (matched_count / total_keywords * 100) if total_keywords else 0
+
+    assert keyword_match_rate == pytest.approx(expected_rate)
+    assert overall_score == pytest.approx(expected_rate * 0.7 + formatting_score * 0.3)
+    assert KEYWORD_WEIGHT + FORMATTING_WEIGHT == pytest.approx(1.0)
@@ -0,0 +1,53 @@
+import uuid
+import warnings
+import pytest
+from models.job import Job
+from models.user_profile import UserProfile
+from scripts.fixtures import get_sample_base_resume
+from services.resume_tailoring import ResumeTailoringService
+
+
+def make_job(job_id):
+    """Unvalidated job, as scripts/test_all_jobs_tailoring.py builds them."""
+    return Job.model_construct(
+        id=job_id,
+        title="Senior Machine Learning Engineer",
+        company="TechCorp",
+        description="Remote role. Experience with python and proficient in kubernetes.",
+        platform="jsearch",
+        platform_url="https://example.com/job",
+        skills=["Python", "AWS", "Kubernetes"]
+    )
+
+
+@pytest.mark.asyncio
+async def test_tailoring_cache_hit_for_reposted_job():
+    """A second job with the same content reuses the cached resume under its own UUID."""
+    service = ResumeTailoringService()
+    base_resume = get_sample_base_resume()
+    user_profile = UserProfile(
+        id=uuid.uuid4(),
+        name="Test User",
+        email="test@example.com",
+        skills=["Python", "AWS", "Leadership"]
+    )
+    first_id, second_id = uuid.uuid4(), uuid.uuid4()
+
+    first = await service.tailor_resume(base_resume, make_job(str(first_id)), user_profile)
+    second = await service.tailor_resume(base_resume, make_job(str(second_id)), user_profile)
+
+    assert len(service._cache) == 1
+    assert first.job_id == first_id
+    assert second.job_id == second_id
+    assert isinstance(second.job_id, uuid.UUID)
+
+    # Serializes cleanly and equals a fresh (uncached) tailoring for that job
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        second.model_dump_json()
+
+    fresh = await ResumeTailoringService().tailor_resume(
+        base_resume, make_job(str(second_id)), user_profile
+    )
+    assert second.model_dump(exclude={'id', 'created_at', 'generated_at'}) == \
+        fresh.model_dump(exclude={'id', 'created_at', 'generated_at'})
@@ -152,15 +152,8 @@ async def view_jobs(
         
         # Skills
         if job['skills']:
-            # Handle JSONB skills
+            # JSONB skills arrive decoded via the pool codec
             skills = job['skills']
-            if isinstance(skills, str):
-                import json
-                try:
-                    skills = json.loads(skills)
-                except:
-                    skills = []
-            
             if isinstance(skills, list) and skills:
                 print(f"\nSkills:       {', '.join(skills[:7])}")
                 if len(skills) > 7: